@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the clock's subscriber dispatch.
+Compares the ticks per second of notifying the subscribers by iterating
+a PriorityQueue on every tick (the way the clock used to do it), against
+the clock's precompiled list of tick calls.
+
+Run from the repository root:
+    python -m benchmarks.clock_subscribers
+"""
+from time import perf_counter
+
+from utilities.priority_queue import PriorityQueue
+from utilities.printer import Printer
+
+from hardware.clock import Clock
+
+TICKS = 20000
+SUBSCRIBER_COUNTS = [1, 10, 1000]
+
+class NullSubscriber:
+    """ A subscriber that does nothing on each tick. """
+    def tick(self, tick_number):
+        pass
+
+def ticks_per_second_with_priority_queue(subscribers, ticks):
+    """ Tick the subscribers by iterating a PriorityQueue on every tick. """
+    queue = PriorityQueue()
+    for s in subscribers:
+        queue.enqueue(s, 0)
+    start = perf_counter()
+    for tick_number in range(1, ticks + 1):
+        for subscriber in queue:
+            subscriber.tick(tick_number)
+    return ticks / (perf_counter() - start)
+
+def ticks_per_second_with_clock(subscribers, ticks):
+    """ Tick the subscribers with the clock. """
+    clock = Clock()
+    clock.overclock()
+    for s in subscribers:
+        clock.add_subscriber(s, 0)
+    start = perf_counter()
+    for _ in range(ticks):
+        clock.tick()
+    return ticks / (perf_counter() - start)
+
+def main():
+    rows = []
+    for count in SUBSCRIBER_COUNTS:
+        subscribers = [NullSubscriber() for _ in range(count)]
+        # Keep the total amount of notifications similar between rows
+        ticks = max(TICKS // count, 100)
+        before = ticks_per_second_with_priority_queue(subscribers, ticks)
+        after = ticks_per_second_with_clock(subscribers, ticks)
+        rows.append([count, ticks, round(before), round(after), round(after / before, 2)])
+    print(Printer.tabulated(rows, headers=["Subscribers", "Ticks", "Before (ticks/s)", "After (ticks/s)", "Speedup"]))
+
+if __name__ == "__main__":
+    main()
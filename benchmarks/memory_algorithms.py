@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the memory algorithms the loader can use.
+Replays the same allocation traces against each algorithm, and reports
+the latency of allocating (percentiles), the external fragmentation and
+the largest hole over time, and how many allocations failed. Traces are
+generated with uniform, bimodal and heavy-tailed (pareto) sizes. Memory
+is never compacted, so fragmentation shows as it builds up.
+
+Run from the repository root:
+    python -m benchmarks.memory_algorithms
+    python -m benchmarks.memory_algorithms --memory-size 65536 --csv curves.csv
+"""
+import argparse
+import csv
+import heapq
+from random import Random
+from time import perf_counter_ns
+
+from utilities.printer import Printer
+from utilities.workload_generator import Uniform, Exponential, Bimodal, Pareto
+
+from operating_system.memory_algorithms.first_fit_algorithm import FirstFitAlgorithm
+from operating_system.memory_algorithms.best_fit_algorithm import BestFitAlgorithm
+from operating_system.memory_algorithms.worst_fit_algorithm import WorstFitAlgorithm
+from operating_system.memory_algorithms.buddy_algorithm import BuddyAlgorithm
+
+# The same algorithms, by the same names, as in the loader
+ALGORITHMS = {
+    'FirstFit': FirstFitAlgorithm,
+    'BestFit':  BestFitAlgorithm,
+    'WorstFit': WorstFitAlgorithm,
+    'Buddy':    BuddyAlgorithm,
+}
+
+MEMORY_SIZE = 4096
+ALLOCATIONS = 20000
+# The memory the live blocks would take on average, if none failed
+LOAD = 0.9
+SAMPLES = 100
+SEED = 0
+
+def size_distributions(memory_size):
+    """ The distributions of the sizes of each trace, scaled to the memory size. """
+    unit = max(1, memory_size // 256)
+    return {
+        'uniform':      Uniform(unit, 8 * unit),
+        'bimodal':      Bimodal(Uniform(unit, 2 * unit), Uniform(16 * unit, 32 * unit), 0.1),
+        'heavy-tailed': Pareto(unit, 1.5, memory_size // 4),
+    }
+
+def allocation_trace(sizes, memory_size, allocations, load, seed):
+    """
+    Returns a trace of ('allocate', block, size) and ('free', block) events.
+    A block is allocated on each step, and lives a random number of steps,
+    long enough for the live blocks to take the given load of the memory.
+    """
+    random = Random(seed)
+    mean_size = sum(sizes.sample(random) for _ in range(1000)) / 1000
+    lifetime = Exponential(max(1, load * memory_size / mean_size))
+    trace = []
+    # Pairs of (step, block), of the blocks to free, the first one first
+    departures = []
+    for block in range(allocations):
+        while (departures and departures[0][0] <= block):
+            trace.append(('free', heapq.heappop(departures)[1]))
+        trace.append(('allocate', block, sizes.sample(random)))
+        heapq.heappush(departures, (block + 1 + lifetime.sample(random), block))
+    while (departures):
+        trace.append(('free', heapq.heappop(departures)[1]))
+    return trace
+
+def replay(algorithm, trace, sample_every):
+    """
+    Replay a trace against a memory algorithm. Returns the latency of each
+    allocation, in nanoseconds, the number of failed allocations, and
+    samples of (allocation, free memory, largest hole, external and
+    internal fragmentation), taken every given number of allocations.
+    The block of a failed allocation is never freed.
+    """
+    blocks = {}
+    latencies = []
+    failed = 0
+    samples = []
+    for event in trace:
+        if (event[0] == 'free'):
+            if (event[1] in blocks):
+                algorithm.free(*blocks.pop(event[1]))
+            continue
+        _, block, size = event
+        start = perf_counter_ns()
+        try:
+            blocks[block] = (algorithm.allocate(size), size)
+        except RuntimeError:
+            failed += 1
+        latencies.append(perf_counter_ns() - start)
+        if (block % sample_every == 0):
+            samples.append((block, algorithm.free_memory, algorithm.largest_hole,
+                            algorithm.external_fragmentation, algorithm.internal_fragmentation))
+    return latencies, failed, samples
+
+def percentile(sorted_values, fraction):
+    """ Returns the value below which the given fraction of the sorted values are. """
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the memory algorithms.")
+    parser.add_argument("--memory-size", type=int, default=MEMORY_SIZE)
+    parser.add_argument("--allocations", type=int, default=ALLOCATIONS)
+    parser.add_argument("--load", type=float, default=LOAD)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--csv", help="Write the fragmentation and largest hole samples to this file")
+    arguments = parser.parse_args()
+
+    sample_every = max(1, arguments.allocations // SAMPLES)
+    curves = []
+    for trace_name, sizes in size_distributions(arguments.memory_size).items():
+        trace = allocation_trace(sizes, arguments.memory_size, arguments.allocations, arguments.load, arguments.seed)
+        rows = []
+        for algorithm_name, algorithm_class in ALGORITHMS.items():
+            latencies, failed, samples = replay(algorithm_class(arguments.memory_size), trace, sample_every)
+            latencies.sort()
+            fragmentations = [sample[3] for sample in samples]
+            largest_holes = [sample[2] for sample in samples]
+            rows.append([
+                algorithm_name,
+                round(percentile(latencies, 0.5) / 1000, 2),
+                round(percentile(latencies, 0.9) / 1000, 2),
+                round(percentile(latencies, 0.99) / 1000, 2),
+                round(latencies[-1] / 1000, 2),
+                failed,
+                round(100 * failed / len(latencies), 2),
+                round(sum(fragmentations) / len(fragmentations), 3),
+                round(max(fragmentations), 3),
+                round(sum(largest_holes) / len(largest_holes)),
+                min(largest_holes),
+                round(sum(sample[4] for sample in samples) / len(samples)),
+            ])
+            curves.extend([trace_name, algorithm_name] + list(sample) for sample in samples)
+        print("Trace: {trace} sizes {sizes}, memory {memory}, {allocations} allocations, load {load}".format(
+            trace=trace_name, sizes=sizes, memory=arguments.memory_size, allocations=arguments.allocations, load=arguments.load))
+        print(Printer.tabulated(rows, headers=[
+            "Algorithm", "p50 (us)", "p90 (us)", "p99 (us)", "Max (us)", "Failed", "Failed %",
+            "Mean ext. frag.", "Max ext. frag.", "Mean largest hole", "Min largest hole", "Mean int. frag."
+        ]))
+        print()
+
+    if (arguments.csv is not None):
+        with open(arguments.csv, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["trace", "algorithm", "allocation", "free_memory", "largest_hole",
+                             "external_fragmentation", "internal_fragmentation"])
+            writer.writerows(curves)
+
+if __name__ == "__main__":
+    main()
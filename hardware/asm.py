@@ -1,37 +1,100 @@
+from enum import IntEnum
+
 from utilities.printer import Printer
 
+class Opcode(IntEnum):
+    """
+    The operation codes of the instructions used by the CPU.
+    Instructions are stored and executed as these small numbers, which
+    fit in a single byte of memory. EMPTY is the content of a memory
+    cell where nothing was written.
+    """
+    EMPTY = 0
+    CPU = 1
+    IO = 2
+    EXIT = 3
+    NOOP = 4
+
 """
-Instructions used by the CPU.
-Current implementation is just a string,
-but they can be more complex entities if used properly.
+Instructions used by the CPU, in their text form.
+The text form is used only to write and display programs, while the
+CPU and the memory work with the opcodes above.
 """
 INSTRUCTION_IO = "IO"
 INSTRUCTION_CPU = "CPU"
 INSTRUCTION_EXIT = "EXIT"
 # Used only to reflect the idea of a non-operation, that is, one not from the above
 INSTRUCTION_NOOP = "NOOP"
+# The text of an empty memory cell
+INSTRUCTION_EMPTY = ""
+
+"""
+The opcodes as plain integers, as comparing against them is
+faster than comparing against the enumeration members.
+"""
+OPCODE_EMPTY = int(Opcode.EMPTY)
+OPCODE_CPU = int(Opcode.CPU)
+OPCODE_IO = int(Opcode.IO)
+OPCODE_EXIT = int(Opcode.EXIT)
+OPCODE_NOOP = int(Opcode.NOOP)
+
+"""The text form of each opcode."""
+MNEMONICS = {
+    Opcode.EMPTY: INSTRUCTION_EMPTY,
+    Opcode.CPU: INSTRUCTION_CPU,
+    Opcode.IO: INSTRUCTION_IO,
+    Opcode.EXIT: INSTRUCTION_EXIT,
+    Opcode.NOOP: INSTRUCTION_NOOP
+}
+
+"""The opcode of each valid instruction in text form."""
+OPCODES = {
+    INSTRUCTION_CPU: Opcode.CPU,
+    INSTRUCTION_IO: Opcode.IO,
+    INSTRUCTION_EXIT: Opcode.EXIT
+}
 
 class ASM:
     """ An utility class to create machine code programs. """
     @classmethod
     def EXIT(self):
         """ Return the EXIT instruction. """
-        return INSTRUCTION_EXIT
+        return Opcode.EXIT
 
     @classmethod
     def NOOP(self):
         """ Return the NOOP instruction. """
-        return INSTRUCTION_NOOP
+        return Opcode.NOOP
+
+    @classmethod
+    def EMPTY(self):
+        """ Return the content of an empty memory cell. """
+        return Opcode.EMPTY
 
     @classmethod
     def IO(self, times=1):
         """ Return as many IO instructions as required. """
-        return [INSTRUCTION_IO] * times
+        return [Opcode.IO] * times
 
     @classmethod
     def CPU(self, times=1):
         """ Return as many CPU instructions as required. """
-        return [INSTRUCTION_CPU] * times
+        return [Opcode.CPU] * times
+
+    @classmethod
+    def encode(self, text):
+        """
+        Return the opcode of an instruction in its text form.
+        Fails with a SyntaxError if it's not a valid instruction.
+        """
+        if text not in OPCODES:
+            raise SyntaxError("Invalid instruction: " + text)
+        return OPCODES[text]
+
+    @classmethod
+    def mnemonic(self, instruction):
+        """ Return the text form of an instruction, for displaying it. """
+        return MNEMONICS[instruction]
 
     @classmethod
     def is_valid(self, instruction):
@@ -48,29 +111,29 @@ class ASM:
     @classmethod
     def is_EXIT(self, instruction):
         """ Answer if the given instruction is the EXIT one. """
-        return INSTRUCTION_EXIT == instruction
+        return OPCODE_EXIT == instruction
 
     @classmethod
     def is_NOOP(self, instruction):
         """ Answer if the given instruction is the NOOP one. """
-        return INSTRUCTION_NOOP == instruction
+        return OPCODE_NOOP == instruction
 
     @classmethod
     def is_IO(self, instruction):
         """ Answer if the given instruction is an IO one. """
-        return INSTRUCTION_IO == instruction
+        return OPCODE_IO == instruction
 
     @classmethod
     def is_CPU(self, instruction):
         """ Answer if the given instruction is a CPU one. """
-        return INSTRUCTION_CPU == instruction
+        return OPCODE_CPU == instruction
 
     @classmethod
     def _colored_instruction_(self, instruction):
         """ Returns the instruction colored for printing. Internal use only. """
         return ({
-            INSTRUCTION_CPU: Printer.str_with_color(INSTRUCTION_CPU, Printer.GREEN),
-            INSTRUCTION_IO: Printer.str_with_color(INSTRUCTION_IO, Printer.BLUE),
-            INSTRUCTION_EXIT: Printer.str_with_color(INSTRUCTION_EXIT, Printer.RED),
-            INSTRUCTION_NOOP: INSTRUCTION_NOOP # No color
-        }[instruction])
\ No newline at end of file
+            OPCODE_CPU: Printer.str_with_color(INSTRUCTION_CPU, Printer.GREEN),
+            OPCODE_IO: Printer.str_with_color(INSTRUCTION_IO, Printer.BLUE),
+            OPCODE_EXIT: Printer.str_with_color(INSTRUCTION_EXIT, Printer.RED),
+            OPCODE_NOOP: INSTRUCTION_NOOP # No color
+        }[instruction])
@@ -1,39 +1,106 @@
-from threading import Thread
-from time import sleep
+from threading import Thread, current_thread
 
 from utilities.priority_queue import PriorityQueue
+from utilities.subscriber_registry import SubscriberRegistry
+
+from hardware.pacer import Pacer
 
 class Clock():
     """
     Emulates a hardware clock.
     We use an observer pattern to implement it,
     so any object can subscribe an listen to the clock tick.
+
+    The clock can also run in fast-forward mode. In that mode, when every
+    subscriber agrees that nothing observable will happen in the following
+    ticks (a device counting down a request, an idle CPU, and so on), the
+    clock jumps straight to the next tick where something happens, instead
+    of notifying every subscriber on every tick. To take part, a subscriber
+    implements:
+        - quiet_ticks(): How many of the upcoming ticks are guaranteed to
+          produce no observable change for the subscriber.
+        - skip_ticks(ticks, tick_number): Advance the subscriber's state
+          as if it had been notified of that many quiet ticks, the last
+          one being tick_number.
+    A subscriber that does not implement them is ticked one tick at a time.
     """
     def __init__(self, speed = 1):
-        """ The speed of the code is expressed in ticks per second. Defaults to 1. """
-        self.__subscribers = PriorityQueue()
+        """
+        The speed of the code is expressed in ticks per second. Defaults to 1.
+        Ticks are paced in real time against a deadline, so the speed holds
+        no matter how long the subscribers take, as long as they take less
+        than a tick.
+        """
+        self.__subscribers = SubscriberRegistry()
         self.__running = False
-        self.__delay = 1 / speed
+        self.__thread = None
+        self.__pacer = Pacer(1 / speed)
         self.__last_tick = 0
         self.__is_overclocked = False
+        self.__is_fast_forwarding = False
+        # Pending events, scheduled to happen at a given tick, that
+        # should never be skipped by fast-forwarding.
+        self.__events = PriorityQueue()
+
+    @property
+    def last_tick(self):
+        """ Returns the number of the last tick performed by the clock. """
+        return self.__last_tick
+
+    @property
+    def pacer(self):
+        """
+        Returns the pacer that keeps the clock in real time. It can
+        be asked for the achieved ticks per second and the jitter.
+        """
+        return self.__pacer
+
+    @property
+    def is_fast_forwarding(self):
+        """ Answers if the clock skips the ticks where nothing happens. """
+        return self.__is_fast_forwarding
 
     def add_subscriber(self, subscriber, priority=0):
         """
         Add a subscriber to this clock. The subscriber will get
         notified each time the clock ticks.
         """
-        self.__subscribers.enqueue(subscriber, priority)
+        self.__subscribers.add(subscriber, priority)
+
+    def remove_subscriber(self, subscriber):
+        """
+        Remove a subscriber from this clock. The subscriber
+        will not be notified of the following ticks.
+        """
+        self.__subscribers.remove(subscriber)
+
+    def schedule(self, tick_number, action):
+        """
+        Schedule an action (a function with no arguments) to be executed at
+        the beginning of the given tick, before the subscribers are notified.
+        Fast-forwarding never jumps over a scheduled action.
+        """
+        if (tick_number <= self.__last_tick):
+            raise RuntimeError("Cannot schedule an action on the past tick: " + str(tick_number))
+        self.__events.enqueue((tick_number, action), -tick_number)
 
     def stop(self):
         """ Stop the clock. """
         self.__running = False
 
+    def wait(self):
+        """ Wait for a stopped clock to finish its last tick, if it was running in the background. """
+        if (self.__thread is not None and self.__thread is not current_thread()):
+            self.__thread.join()
+
     def start(self):
         """ Start the clock. """
         self.__running = True
+        # Measure the real time performance of this run only
+        self.__pacer.restart()
         # Run as a thread in the background
-        t = Thread(target=self.__start)
-        t.start()
+        self.__thread = Thread(target=self.__start)
+        self.__thread.start()
 
     def __start(self):
         """ The function that executes when the clock starts, in a new thread. """
@@ -42,13 +109,127 @@ class Clock():
 
     def tick(self):
         """ The tick function is executed with each tick of the clock. """
+        self.__restart_pacer_if_stopped()
         self.__last_tick += 1
+        ## run the actions scheduled for this tick, if any
+        self.__run_scheduled_events()
         ## notify all subscriber that a new clock cycle has started
-        for subscriber in self.__subscribers:
-            subscriber.tick(self.__last_tick)
-        ## wait for a while and keep looping
+        for tick in self.__subscribers.tick_calls:
+            tick(self.__last_tick)
+        ## wait for the next tick to begin and keep looping
         if (not self.__is_overclocked):
-            sleep(self.__delay)
+            self.__pacer.wait()
+
+    def run(self, ticks):
+        """
+        Perform the given number of ticks. When fast-forwarding, the ticks
+        where nothing observable happens are skipped in a single step, but
+        the tick count and the subscribers' state end up being the same.
+        """
+        self.__run(ticks, None)
+
+    def run_until(self, predicate, max_ticks):
+        """
+        Perform ticks until the predicate (a function with no arguments)
+        answers True, but never more than max_ticks ticks. The predicate
+        is checked before the first tick and after every tick (or after
+        every group of skipped ticks, when fast-forwarding).
+        Answers if the predicate was met.
+        """
+        return self.__run(max_ticks, predicate)
+
+    def __run(self, ticks, predicate):
+        """ Perform up to the given number of ticks, or until the predicate is met. """
+        self.__restart_pacer_if_stopped()
+        if (predicate is not None and predicate()):
+            return True
+        target_tick = self.__last_tick + ticks
+        while (self.__last_tick < target_tick):
+            if (not self.__is_fast_forwarding):
+                return self.__run_ticks(target_tick - self.__last_tick, predicate)
+            quiet_ticks = min(self.__quiet_ticks(), target_tick - self.__last_tick)
+            if (quiet_ticks > 0):
+                self.__skip_ticks(quiet_ticks)
+            else:
+                self.__run_ticks(1, None)
+            if (predicate is not None and predicate()):
+                return True
+        return False
+
+    def __restart_pacer_if_stopped(self):
+        """
+        When ticks are asked for by hand, instead of by the running clock,
+        the time since the last ones is a pause, not a delay to catch up
+        with. So the pacer starts counting periods again from now.
+        """
+        if (not self.__running):
+            self.__pacer.restart()
+
+    def __run_ticks(self, ticks, predicate):
+        """
+        Perform the given number of ticks, one by one, in a tight loop.
+        Every lookup that does not change between ticks is done once, before
+        looping. As scheduled actions are the only thing expected to change
+        the subscribers in the middle of a run, the tick calls are only
+        looked up again after running them.
+        Answers if the predicate was met.
+        """
+        tick_calls = self.__subscribers.tick_calls
+        events = self.__events
+        wait = None if self.__is_overclocked else self.__pacer.wait
+        first_tick = self.__last_tick + 1
+        for tick_number in range(first_tick, first_tick + ticks):
+            self.__last_tick = tick_number
+            if (events and events.front[0] <= tick_number):
+                self.__run_scheduled_events()
+                tick_calls = self.__subscribers.tick_calls
+            for tick in tick_calls:
+                tick(tick_number)
+            if (wait is not None):
+                wait()
+            if (predicate is not None and predicate()):
+                return True
+        return False
+
+    def __quiet_ticks(self):
+        """
+        Answer how many upcoming ticks can be skipped, that is, the
+        minimum among the subscribers and the next scheduled event.
+        """
+        quiet_ticks = float("inf")
+        if (not self.__events.is_empty):
+            next_event_tick, _ = self.__events.front
+            quiet_ticks = next_event_tick - self.__last_tick - 1
+        for subscriber in self.__subscribers:
+            if (quiet_ticks <= 0):
+                break
+            if (not hasattr(subscriber, "quiet_ticks")):
+                return 0
+            quiet_ticks = min(quiet_ticks, subscriber.quiet_ticks())
+        return quiet_ticks
+
+    def __skip_ticks(self, ticks):
+        """ Jump over the given number of quiet ticks at once. """
+        self.__last_tick += ticks
+        for subscriber in self.__subscribers:
+            subscriber.skip_ticks(ticks, self.__last_tick)
+
+    def __run_scheduled_events(self):
+        """ Execute every action that was scheduled for the current tick. """
+        while (not self.__events.is_empty and self.__events.front[0] <= self.__last_tick):
+            _, action = self.__events.dequeue()
+            action()
+
+    def fast_forward(self):
+        """
+        Start skipping the ticks where nothing observable happens.
+        Only the ticks performed through run and run_until are skipped.
+        """
+        self.__is_fast_forwarding = True
+
+    def step_by_step(self):
+        """ Go back to notifying the subscribers on every single tick. """
+        self.__is_fast_forwarding = False
 
     def overclock(self):
         """
@@ -62,4 +243,4 @@ class Clock():
         Reset the clock to it's regular speed.
         Not really needed, but useful for debugging.
         """
-        self.__is_overclocked = False
\ No newline at end of file
+        self.__is_overclocked = False
@@ -1,26 +1,57 @@
-from random import randint
-
 from utilities.printer import Printer
 
-from hardware.asm import ASM
+from hardware.asm import ASM, Opcode, OPCODE_CPU
 from hardware.irq import IRQ
 
 class Cpu():
     """ Models the hardware"s CPU. """
 
-    def __init__(self, mmu, interrupt_vector, number_of_io_devices):
+    def __init__(self, mmu, interrupt_vector, device_selector, core_id=0, predecode=False):
         """
         The mmu and interruption vectors should be known by the CPU.
-        Additionally, the number of IO devices should be known, as the be
-        able to access a device randomly.
+        Additionally, the IO device selector should be known, as it chooses
+        the device each IO instruction accesses.
+        When the hardware has several cores, each core is a different CPU,
+        with its own registries and MMU, identified by the core id.
+        If predecode is True, the decoded instruction of each memory address
+        is cached, until the address is written again.
         """
+        self.__core_id = core_id
         # Other hardware components
         self.__mmu = mmu
         self.__interrupt_vector = interrupt_vector
-        self.__number_of_io_devices = number_of_io_devices
+        self.__next_device = device_selector.next_device
         # Registries
         self.__pc = -1
         self.__ir = ASM.NOOP()
+        self.__address = -1
+        # Ticks left in which the CPU waits for memory, executing nothing
+        self.__stalled_ticks = 0
+        # Length of the burst of CPU instructions starting at each physical
+        # address, computed when first needed, and forgotten if memory changes.
+        self.__bursts = {}
+        mmu.memory.add_write_observer(self.__forget_bursts)
+        # Decoded instructions by physical address, when predecoding
+        self.__decoded = {} if predecode else None
+        if (predecode):
+            mmu.memory.add_write_observer(self.__invalidate_decoded)
+        # The decode stage is table driven, the table has, for each opcode,
+        # the function that executes the instruction.
+        self.__dispatch_table = [self.__execute_noop] * len(Opcode)
+        self.register_instruction(Opcode.CPU, self.__execute_cpu)
+        self.register_instruction(Opcode.IO, self.__execute_io)
+        self.register_instruction(Opcode.EXIT, self.__execute_exit)
+        self.__execute_instruction = self.__execute_noop
+
+    @property
+    def core_id(self):
+        """Returns the id of the core this CPU is"""
+        return self.__core_id
+
+    @property
+    def mmu(self):
+        """Returns the MMU of this CPU"""
+        return self.__mmu
 
     @property
     def pc(self):
@@ -47,12 +78,28 @@ class Cpu():
         """Answers if the CPU is idle. If the PC is -1, is idle"""
         return self.__pc == -1
 
+    @property
+    def stalled_ticks(self):
+        """Returns how many ticks the CPU still waits for memory"""
+        return self.__stalled_ticks
+
+    def stall(self, ticks):
+        """
+        Make the CPU wait the given number of ticks, executing nothing,
+        as memory is busy (for example, while the OS moves it around).
+        """
+        self.__stalled_ticks += ticks
+
     def tick(self, tick_number):
         """Emulate a tick of the clock, performing the FDE cycle"""
         # Remember lat tick for printing purposes
         self.__last_tick = tick_number-1
+        # If the CPU is stalled, the tick is spent waiting for memory
+        if (self.__stalled_ticks > 0):
+            self.__stalled_ticks -= 1
+            self.__show_instruction(ASM.NOOP())
         # If the CPU is idle, no action is performed
-        if (self.is_idle):
+        elif (self.is_idle):
             self.__show_instruction(ASM.NOOP())
         else:
             # Perform FDE cycle
@@ -60,28 +107,120 @@ class Cpu():
             self.__decode()
             self.__execute()
 
+    def quiet_ticks(self):
+        """
+        Answer how many of the upcoming ticks have no effect outside the CPU.
+        An idle CPU does nothing. A busy one can execute a burst of CPU
+        instructions without anything else noticing, until it reaches an
+        instruction of another kind. A stalled CPU does nothing until
+        the stall is over.
+        """
+        if (self.__stalled_ticks > 0):
+            return self.__stalled_ticks
+        if (self.is_idle):
+            return float("inf")
+        return self.__burst_length()
+
+    def skip_ticks(self, ticks, tick_number):
+        """
+        Skip some ticks, on which the CPU was idle, or
+        executing a burst of CPU instructions.
+        """
+        self.__last_tick = tick_number-1
+        if (self.__stalled_ticks > 0):
+            # Never more ticks than the stalled ones, as told by quiet_ticks
+            self.__stalled_ticks -= ticks
+        elif (self.is_busy):
+            self.__mmu.skip_translations(self.__pc, ticks)
+            self.__pc = self.__pc + ticks
+            self.__ir = OPCODE_CPU
+
+    def __burst_length(self):
+        """
+        Answer how many CPU instructions there are in a row, from the one
+        at the PC, without going past the limit of the current process,
+        nor the memory contiguous to the PC (the page, when paging).
+        """
+        if (self.__pc >= self.__mmu.limit):
+            # Let the next tick fail when fetching
+            return 0
+        address, end = self.__mmu.contiguous_range(self.__pc)
+        if (address is None):
+            # The page is not in memory, let the next tick fault
+            return 0
+        length = self.__bursts.get(address)
+        if (length is None):
+            length = self.__mmu.memory.run_length(address, OPCODE_CPU, end)
+            self.__bursts[address] = length
+        return length
+
+    def __forget_bursts(self, addr, size):
+        """ Forget the known bursts, as memory has changed. """
+        self.__bursts.clear()
+
+    def register_instruction(self, opcode, execute):
+        """
+        Register the function (with no arguments) that executes
+        the instructions with the given opcode.
+        """
+        self.__dispatch_table[opcode] = execute
+        # Anything decoded before may now be outdated
+        if (self.__decoded is not None):
+            self.__decoded.clear()
+
     def __fetch(self):
         """Perform the Fetch part of a FDE cycle."""
-        self.__ir =  self.__mmu.fetch(self.__pc) or ASM.NOOP()
+        self.__address = self.__mmu.translate(self.__pc)
+        if (self.__address is None):
+            # A page fault, the tick is spent on it, and the same
+            # instruction is fetched again after its page is brought
+            # to memory
+            self.__ir = ASM.NOOP()
+            return
+        self.__ir =  self.__mmu.memory.read(self.__address) or ASM.NOOP()
         self.__pc = self.__pc + 1
 
     def __decode(self):
-        """Perform the Decode part of a FDE cycle."""
-        # Current implementation does not do anything at the moment
-        pass
+        """
+        Perform the Decode part of a FDE cycle.
+        That is, find the function that executes the instruction in the IR,
+        from the dispatch table or, if predecoding, from the cache.
+        """
+        if (self.__address is None):
+            self.__execute_instruction = self.__execute_page_fault
+            return
+        if (self.__decoded is None):
+            self.__execute_instruction = self.__dispatch_table[self.__ir]
+            return
+        execute = self.__decoded.get(self.__address)
+        if (execute is None):
+            execute = self.__dispatch_table[self.__ir]
+            self.__decoded[self.__address] = execute
+        self.__execute_instruction = execute
+
+    def __invalidate_decoded(self, addr, size):
+        """ Forget the decoded instructions of the memory addresses that were written. """
+        if (size > len(self.__decoded)):
+            # Cheaper to forget everything than to go over each address
+            self.__decoded.clear()
+            return
+        for written in range(addr, addr + size):
+            self.__decoded.pop(written, None)
 
     def __execute(self):
         """Perform the Execute part of a FDE cycle."""
         # Any action should pass through __execute_any
         self.__execute_any()
         # Now, execute differently according to the actual instruction
-        # to be executed. We delegate the task to another method.
-        if ASM.is_CPU(self.__ir):
-            self.__execute_cpu()
-        if ASM.is_IO(self.__ir):
-            self.__execute_io()
-        if ASM.is_EXIT(self.__ir):
-            self.__execute_exit()
+        # to be executed, as it was decoded.
+        self.__execute_instruction()
+
+    def __execute_noop(self):
+        """
+        Instructions that are not valid, such as NOOP, are executed this way.
+        Nothing is there to do.
+        """
+        pass
 
     def __execute_any(self):
         """
@@ -102,15 +241,22 @@ class Cpu():
         The IO instructions are executed in this way.
         An IO_IN interruption should be handled by the interruption vector
         """
-        random_dev_id = randint(0, self.__number_of_io_devices-1)
-        self.__interrupt_vector.handle(IRQ.IO_IN(random_dev_id))
+        dev_id = self.__next_device()
+        self.__interrupt_vector.handle(IRQ.IO_IN(dev_id, self.__core_id))
 
     def __execute_exit(self):
         """
         The EXIT instructions are executed in this way.
         A KILL interruption should be handled by the interruption vector
         """
-        self.__interrupt_vector.handle(IRQ.KILL())
+        self.__interrupt_vector.handle(IRQ.KILL(self.__core_id))
+
+    def __execute_page_fault(self):
+        """
+        When the page of the instruction is not in memory, a PAGE_FAULT
+        interruption should be handled by the interruption vector.
+        """
+        self.__interrupt_vector.handle(IRQ.PAGE_FAULT(self.__mmu.page_of(self.__pc), self.__core_id))
 
     def __show_instruction(self, instruction):
         """Print an instruction to the screen"""
@@ -118,8 +264,8 @@ class Cpu():
 
     def __repr__(self):
         return Printer.tabulated([
+            ["Core", self.__core_id],
             ["PC", self.__pc],
-            ["IR", self.__ir],
-            ["Base", self.__mmu.baseDir],
-            ["Limit", self.__mmu.limit]
-        ])
+            ["IR", ASM.mnemonic(self.__ir)],
+            ["Stalled", self.__stalled_ticks]
+        ] + self.__mmu.registers)
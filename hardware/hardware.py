@@ -1,11 +1,15 @@
 from utilities.printer import Printer
 
 from hardware.memory import Memory
+from hardware.mapped_memory import MappedMemory
 from hardware.mmu import MMU
+from hardware.paged_mmu import PagedMMU, DEFAULT_TLB_SIZE
+from hardware.swap_drive import SwapDrive
 from hardware.cpu import Cpu
 from hardware.io_device import IODevice
 from hardware.clock import Clock
 from hardware.interrupt_vector import InterruptVector
+from hardware.io_device_selector import UniformDeviceSelector, WeightedDeviceSelector, RoundRobinDeviceSelector
 
 class Hardware():
     """
@@ -13,9 +17,39 @@ class Hardware():
     other components wired in, if you may.
     """
 
-    def setup(self, memory_size = 20, clock_speed = 1, device_timings = []):
-        self.__memory = Memory(memory_size)
-        self.__mmu = MMU(self.__memory)
+    def setup(self, memory_size = 20, clock_speed = 1, device_timings = [], number_of_cores = 1,
+              seed = None, io_selection = 'uniform', io_weights = None, predecode = False,
+              page_size = None, tlb_size = DEFAULT_TLB_SIZE, swap_size = 0, swap_path = None,
+              mapped_memory = False, memory_path = None):
+        """
+        Build all the components of the hardware.
+        The seed, if given, makes the choice of IO devices reproducible.
+        The IO selection is the name of the policy the CPU uses to choose
+        the device of an IO instruction ('uniform', 'weighted' or
+        'round_robin'), the weighted policy requires a weight per device.
+        If predecode is True, the CPU cores cache decoded instructions.
+        If a page size is given, memory is paged, and the MMU of each core
+        translates through page tables, with a TLB of the given size.
+        If a swap size is also given, pages are kept in a swap drive, backed
+        by the file in the swap path (or a temporary one), and are brought
+        to memory when needed.
+        If mapped memory is True, or a memory path is given, the memory is
+        a memory map, anonymous or of the file in the memory path, which
+        keeps the cells (but not the OS state) after the run. As the OS
+        state is lost, the file cannot be mapped again while it has cells
+        other than EMPTY.
+        """
+        if (mapped_memory or memory_path is not None):
+            self.__memory = MappedMemory(memory_size, memory_path)
+        else:
+            self.__memory = Memory(memory_size)
+        self.__page_size = page_size
+        self.__swap = None
+        self.__accessed_frames = None
+        if (page_size is not None):
+            self.__accessed_frames = bytearray(memory_size // page_size)
+            if (swap_size > 0):
+                self.__swap = SwapDrive(swap_size, swap_path)
 
         self.__interrupt_vector = InterruptVector()
 
@@ -23,37 +57,96 @@ class Hardware():
         for i in range(0, len(device_timings)):
             self.__io_devices.append(IODevice(i, device_timings[i], self.__interrupt_vector))
 
-        self.__cpu = Cpu(self.__mmu, self.__interrupt_vector, len(self.__io_devices))
+        # The device used by each IO instruction is chosen by the selector,
+        # which is shared by all the cores.
+        self.__device_selector = self.__create_device_selector(io_selection, len(self.__io_devices), seed, io_weights)
+
+        # Each core is a full CPU, with its own registries, and its own
+        # MMU, so each one can run a different process. All of them
+        # share the same memory.
+        self.__cores = []
+        for core_id in range(0, number_of_cores):
+            mmu = MMU(self.__memory) if page_size is None else PagedMMU(self.__memory, page_size, tlb_size, self.__accessed_frames)
+            self.__cores.append(Cpu(mmu, self.__interrupt_vector, self.__device_selector, core_id, predecode))
 
         self.__clock = Clock(clock_speed)
         # The order in which the elements are added to the clock
         # is important, the CPU needs to be added first, as
         # some instructions may activate actions. This behavior
-        # is taken into account in the IO devices.
-        self.__clock.add_subscriber(self.__cpu, 30)
+        # is taken into account in the IO devices. Cores are
+        # notified in order, as they have the same priority.
+        for core in self.__cores:
+            self.__clock.add_subscriber(core, 30)
         for io in self.__io_devices:
             self.__clock.add_subscriber(io, 15)
 
     @property
     def cpu(self):
-        """ Returns the hardware's CPU. """
-        return self.__cpu
+        """ Returns the hardware's CPU, the first core if there are many. """
+        return self.__cores[0]
+
+    @property
+    def cores(self):
+        """ Returns the list of all CPU cores. """
+        return self.__cores
+
+    @property
+    def number_of_cores(self):
+        """ Returns the number of CPU cores. """
+        return len(self.__cores)
+
+    def core(self, core_id):
+        """ Return the CPU core with the given id. """
+        return self.__cores[core_id]
+
+    def stall(self, ticks):
+        """ Make every core wait the given number of ticks, as memory is busy. """
+        for core in self.__cores:
+            core.stall(ticks)
 
     @property
     def memory(self):
         """ Returns the hardware's memory. """
         return self.__memory
 
+    @property
+    def page_size(self):
+        """ Returns the size of the memory pages, or None if memory is not paged. """
+        return self.__page_size
+
+    @property
+    def is_paged(self):
+        """ Answers if memory is paged. """
+        return self.__page_size is not None
+
+    @property
+    def swap(self):
+        """ Returns the swap drive, or None if pages are not swapped. """
+        return self.__swap
+
+    @property
+    def accessed_frames(self):
+        """
+        Returns, when paging, a bit for each frame, set by the MMUs when
+        a page in the frame is accessed, and cleared by the OS.
+        """
+        return self.__accessed_frames
+
     @property
     def mmu(self):
-        """ Returns the hardware's mmu. """
-        return self.__mmu
+        """ Returns the hardware's mmu, the one of the first core if there are many. """
+        return self.__cores[0].mmu
 
     @property
     def io_devices(self):
         """ Return a list of all IO devices. """
         return self.__io_devices
 
+    @property
+    def device_selector(self):
+        """ Returns the selector the CPU uses to choose IO devices. """
+        return self.__device_selector
+
     @property
     def interrupt_vector(self):
         """ Returns the interruption vector. """
@@ -72,6 +165,16 @@ class Hardware():
         """ Return the IO device with the given id. """
         return self.__io_devices[io_device_id]
 
+    def __create_device_selector(self, io_selection, number_of_devices, seed, io_weights):
+        """ Create the IO device selector for the policy with the given name. """
+        if (io_selection == 'uniform'):
+            return UniformDeviceSelector(number_of_devices, seed)
+        if (io_selection == 'weighted'):
+            return WeightedDeviceSelector(number_of_devices, io_weights, seed)
+        if (io_selection == 'round_robin'):
+            return RoundRobinDeviceSelector(number_of_devices)
+        raise RuntimeError("There is no IO selection policy by the name: " + io_selection)
+
     def turn_on(self):
         """ Start the hardware's clock. """
         self.__clock.start()
@@ -80,10 +183,22 @@ class Hardware():
         """ Stop the hardware's clock. """
         self.__clock.stop()
 
+    def close(self):
+        """
+        Turn off the hardware, and close its memory and swap drive, storing
+        their cells in their files, if any. It cannot be used afterwards.
+        """
+        self.turn_off()
+        # The last tick may still be running, and using the memory
+        self.__clock.wait()
+        self.__memory.close()
+        if (self.__swap is not None):
+            self.__swap.close()
+
     def __repr__(self):
         cpu_panel = Printer.tabulated([[
-            self.__cpu
-        ]], headers=["CPU"], numalign="center", stralign="left")
+            core
+        ] for core in self.__cores], headers=["CPU"], numalign="center", stralign="left")
 
         io_devices_panel = Printer.tabulated([[
             "\n".join([str(d) for d in self.__io_devices]),
@@ -99,8 +214,3 @@ class Hardware():
             ]],
             tablefmt="plain"
         )
-
-
-"""An instance of the hardware that acts as a global variable
-being accessible from anywhere"""
-HARDWARE = Hardware()
\ No newline at end of file
@@ -50,6 +50,20 @@ class IODevice:
             self.__current_request_steps = -1
             self.__interrupt_vector.handle(IRQ.IO_OUT(self.__device_id))
 
+    def quiet_ticks(self):
+        """
+        Answer how many of the upcoming ticks just advance the current
+        request, without finishing it. An idle device never does anything.
+        """
+        if (not self.__is_busy):
+            return float("inf")
+        return self.__operation_time - self.__current_request_steps - 1
+
+    def skip_ticks(self, ticks, tick_number):
+        """ Advance the current request as if the given ticks have passed. """
+        if (self.__is_busy):
+            self.__current_request_steps += ticks
+
     def __repr__(self):
         return Printer.tabulated([
             ["ID", self.__device_id],
@@ -0,0 +1,94 @@
+from array import array
+from random import Random
+
+# How many device ids are sampled at once by the random selectors
+DEFAULT_BLOCK_SIZE = 1024
+
+class AbstractDeviceSelector:
+    """
+    Models the way the CPU chooses the IO device an IO instruction uses.
+    Each hardware has its own selector, so runs are independent from each
+    other and, when seeded, reproducible.
+    """
+
+    def __init__(self, number_of_devices):
+        self.__number_of_devices = number_of_devices
+
+    @property
+    def number_of_devices(self):
+        """ Returns the number of devices to choose from. """
+        return self.__number_of_devices
+
+    def next_device(self):
+        """ Returns the id of the device the next IO instruction uses. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    def _fail_if_no_devices(self):
+        """ Fail if there is no device to choose. Internal use only. """
+        if (self.__number_of_devices == 0):
+            raise RuntimeError("There are no IO devices to perform IO")
+
+
+class SampledDeviceSelector(AbstractDeviceSelector):
+    """
+    A selector that chooses devices randomly. Instead of asking the random
+    generator on each IO instruction, ids are sampled in blocks, which are
+    consumed one by one and refilled when exhausted.
+    """
+
+    def __init__(self, number_of_devices, seed = None, block_size = DEFAULT_BLOCK_SIZE):
+        super().__init__(number_of_devices)
+        self.__random = Random(seed)
+        self.__block_size = block_size
+        self.__samples = array('l')
+        self.__next = 0
+
+    def next_device(self):
+        if (self.__next >= len(self.__samples)):
+            self._fail_if_no_devices()
+            self.__samples = array('l', self._sample(self.__random, self.__block_size))
+            self.__next = 0
+        device_id = self.__samples[self.__next]
+        self.__next += 1
+        return device_id
+
+    def _sample(self, random, k):
+        """ Returns a list of k device ids. Should be implemented by the subclass. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+
+class UniformDeviceSelector(SampledDeviceSelector):
+    """ Chooses any device with the same probability. """
+
+    def _sample(self, random, k):
+        return random.choices(range(0, self.number_of_devices), k=k)
+
+
+class WeightedDeviceSelector(SampledDeviceSelector):
+    """ Chooses each device with a probability proportional to its weight. """
+
+    def __init__(self, number_of_devices, weights, seed = None, block_size = DEFAULT_BLOCK_SIZE):
+        if (len(weights) != number_of_devices):
+            raise RuntimeError("There should be one weight per IO device")
+        super().__init__(number_of_devices, seed, block_size)
+        self.__weights = weights
+
+    def _sample(self, random, k):
+        return random.choices(range(0, self.number_of_devices), weights=self.__weights, k=k)
+
+
+class RoundRobinDeviceSelector(AbstractDeviceSelector):
+    """
+    Chooses each device in turn, starting from the first one.
+    There is nothing random in it, so it takes no seed.
+    """
+
+    def __init__(self, number_of_devices):
+        super().__init__(number_of_devices)
+        self.__next = 0
+
+    def next_device(self):
+        self._fail_if_no_devices()
+        device_id = self.__next
+        self.__next = (self.__next + 1) % self.number_of_devices
+        return device_id
@@ -10,24 +10,25 @@ IO_IN_IRQ = "#IO_IN"
 IO_OUT_IRQ = "#IO_OUT"
 SWAP_IRQ = "#SWAP"
 DISPATCH_IRQ = "#DISPATCH"
+PAGE_FAULT_IRQ = "#PAGE_FAULT"
 
 class IRQ:
     """ Models an Interruption, with it's code and arguments. """
 
     @classmethod
-    def KILL(self):
-        """ Return an interruption for the KILL code. """
-        return IRQ(KILL_IRQ, [])
+    def KILL(self, core=0):
+        """ Return an interruption for the KILL code, raised by the given CPU core. """
+        return IRQ(KILL_IRQ, [core])
 
     @classmethod
-    def NEW(self, program, priority=0):
-        """ Return an interruption for the NEW code. """
-        return IRQ(NEW_IRQ, [program, priority])
+    def NEW(self, program, priority=0, name=None):
+        """ Return an interruption for the NEW code, for a process with the given name, or the program's one. """
+        return IRQ(NEW_IRQ, [program, priority, name])
 
     @classmethod
-    def IO_IN(self, device):
-        """ Return an interruption for the IO_IN code for the given device. """
-        return IRQ(IO_IN_IRQ, [device])
+    def IO_IN(self, device, core=0):
+        """ Return an interruption for the IO_IN code for the given device, raised by the given CPU core. """
+        return IRQ(IO_IN_IRQ, [device, core])
 
     @classmethod
     def IO_OUT(self, device):
@@ -35,14 +36,28 @@ class IRQ:
         return IRQ(IO_OUT_IRQ, [device])
 
     @classmethod
-    def SWAP(self):
-        """ Return an interruption for the SWAP code. """
-        return IRQ(SWAP_IRQ, [])
+    def SWAP(self, core=None):
+        """
+        Return an interruption for the SWAP code, for the given CPU core.
+        If no core is given, it applies to all the cores.
+        """
+        return IRQ(SWAP_IRQ, [core])
 
     @classmethod
-    def DISPATCH(self, preemptive = True):
-        """ Return an interruption for the DISPATCH code. """
-        return IRQ(DISPATCH_IRQ, [preemptive])
+    def DISPATCH(self, preemptive = True, core=None):
+        """
+        Return an interruption for the DISPATCH code, for the given CPU core.
+        If no core is given, it applies to all the cores.
+        """
+        return IRQ(DISPATCH_IRQ, [preemptive, core])
+
+    @classmethod
+    def PAGE_FAULT(self, page, core=0):
+        """
+        Return an interruption for the PAGE_FAULT code, raised by the given
+        CPU core when the page it needs is not in memory.
+        """
+        return IRQ(PAGE_FAULT_IRQ, [page, core])
 
     def __init__(self, code, arguments = []):
         """ Create a new interruption. """
@@ -0,0 +1,66 @@
+import mmap
+import os
+import re
+
+from hardware.memory import Memory
+
+# Finds a cell that is not EMPTY
+NOT_EMPTY_PATTERN = re.compile(b"[^\x00]")
+
+class MappedMemory(Memory):
+    """
+    Models the Hardware memory, with its cells in a memory map instead of
+    a bytearray. The OS of the host only allocates the pages of the map
+    that are written, so very large memories (10^8 cells and more) cost
+    only as much as they are used.
+    If no path is given, the map is anonymous, and it's lost when closed.
+    Otherwise, it maps the file in the path, which is created if needed.
+    The file is only backing storage for the cells. They are kept after
+    closing, so they can be inspected after a run. But nothing of the OS
+    is stored: neither the processes, nor which cells the loader gave to
+    them. A new OS would start with every cell free, and write over them,
+    so a simulation cannot be resumed from the file, and mapping a file
+    that still has cells other than EMPTY fails. A run that ends with
+    every process finished leaves the file EMPTY, so it can be mapped
+    again; otherwise, remove it or give another path.
+    """
+
+    def __init__(self, size, path = None):
+        self.__path = path
+        if (path is None):
+            self.__file = None
+            cells = mmap.mmap(-1, size)
+        else:
+            self.__file = open(path, "r+b" if os.path.exists(path) else "w+b")
+            # Never truncate a larger image, the cells past the size are ignored
+            if (os.fstat(self.__file.fileno()).st_size < size):
+                self.__file.truncate(size)
+            cells = mmap.mmap(self.__file.fileno(), size)
+            if (NOT_EMPTY_PATTERN.search(cells)):
+                cells.close()
+                self.__file.close()
+                raise RuntimeError("The memory file " + path + " still has the cells of another run, which a new OS would write over. Remove it, or give another path.")
+        self.__cells = cells
+        super().__init__(size, cells)
+
+    @property
+    def path(self):
+        """ Returns the path of the file the memory is kept in, or None if it's anonymous. """
+        return self.__path
+
+    @property
+    def is_persistent(self):
+        """ Answers if the cells are kept in a file after the memory is closed. """
+        return self.__path is not None
+
+    def flush(self):
+        """ Make sure every cell written is stored in the file, if any. """
+        if (self.__file is not None):
+            self.__cells.flush()
+
+    def close(self):
+        """ Close the memory, and its file, storing every cell written first. """
+        self.flush()
+        self.__cells.close()
+        if (self.__file is not None):
+            self.__file.close()
@@ -1,24 +1,109 @@
+import re
+
 from utilities.printer import Printer
 
+from hardware.asm import ASM
+
 class Memory():
-    """ Models the Hardware memory. """
+    """
+    Models the Hardware memory.
+    Each cell holds the opcode of an instruction in a single byte,
+    so cells are stored in a bytearray instead of a list of objects.
+    Empty cells hold the EMPTY opcode, that is, zero.
+    The cells may also be given, as any writable buffer of the given
+    size (such as a memory map), so the memory can be stored elsewhere.
+    """
 
-    def __init__(self, size):
+    def __init__(self, size, cells = None):
         self.__size = size
-        self.__cells = [""] * size
+        self.__cells = bytearray(size) if cells is None else cells
+        self.__write_observers = []
+        # Patterns that find the first cell with a value other than a given one
+        self.__different_value_patterns = {}
+
+    def flush(self):
+        """ Make sure every cell written is stored. Nothing to do, as cells are only kept in the bytearray. """
+        pass
+
+    def close(self):
+        """ Close the memory. Nothing to do, as there is no file behind the bytearray. """
+        pass
+
+    def add_write_observer(self, observer):
+        """
+        Add an observer (a function that receives the first address
+        and the number of cells written) that is called each time
+        memory is written.
+        """
+        self.__write_observers.append(observer)
 
     def write(self, addr, value):
-        """ Write a given value to a given memory address. """
+        """ Write a given value (an opcode) to a given memory address. """
         self.__cells[addr] = value
+        for observer in self.__write_observers:
+            observer(addr, 1)
+
+    def write_block(self, addr, data):
+        """
+        Write many values (any bytes-like object of opcodes) starting
+        at a given memory address, copying them in a single slice.
+        """
+        size = len(data)
+        if (addr < 0 or addr + size > self.__size):
+            raise RuntimeError("Cannot write {size} cells at address {addr}, out of memory".format(size=size, addr=addr))
+        self.__cells[addr:addr + size] = data
+        for observer in self.__write_observers:
+            observer(addr, size)
+
+    def fill(self, addr, size, value = 0):
+        """
+        Write the same value (an opcode, EMPTY by default) to the given
+        number of cells, starting at a given memory address, in a single slice.
+        """
+        if (addr < 0 or addr + size > self.__size):
+            raise RuntimeError("Cannot fill {size} cells at address {addr}, out of memory".format(size=size, addr=addr))
+        self.__cells[addr:addr + size] = bytes(size) if value == 0 else bytes([value]) * size
+        for observer in self.__write_observers:
+            observer(addr, size)
+
+    def move_block(self, source, destination, size):
+        """
+        Copy the given number of cells from the source address to the
+        destination one, in a single slice. The blocks may overlap.
+        """
+        if (min(source, destination) < 0 or max(source, destination) + size > self.__size):
+            raise RuntimeError("Cannot move {size} cells from {source} to {destination}, out of memory".format(
+                size=size, source=source, destination=destination))
+        self.__cells[destination:destination + size] = self.__cells[source:source + size]
+        for observer in self.__write_observers:
+            observer(destination, size)
 
     def read(self, addr):
-        """ Write the value stored from a given memory address. """
+        """ Write the value (an opcode) stored from a given memory address. """
         return self.__cells[addr]
 
+    def read_block(self, addr, size):
+        """ Returns the values stored from a given memory address, as bytes, read in a single slice. """
+        if (addr < 0 or addr + size > self.__size):
+            raise RuntimeError("Cannot read {size} cells at address {addr}, out of memory".format(size=size, addr=addr))
+        return bytes(self.__cells[addr:addr + size])
+
+    def run_length(self, addr, value, end):
+        """
+        Answer how many consecutive cells hold the given value,
+        starting at the given address and stopping before the end one.
+        """
+        pattern = self.__different_value_patterns.get(value)
+        if pattern is None:
+            pattern = re.compile(b"[^" + re.escape(bytes([value])) + b"]")
+            self.__different_value_patterns[value] = pattern
+        match = pattern.search(self.__cells, addr, end)
+        return (match.start() if match else max(end, addr)) - addr
+
     @property
     def size(self):
         """ Answer the memory size. """
         return self.__size
 
     def __repr__(self):
-        return Printer.tabulated(enumerate(self.__cells))
\ No newline at end of file
+        return Printer.tabulated([(addr, ASM.mnemonic(cell)) for addr, cell in enumerate(self.read_block(0, self.__size))])
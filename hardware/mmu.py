@@ -25,11 +25,46 @@ class MMU():
     def baseDir(self, baseDir):
         self.__baseDir = baseDir
 
-    def fetch(self,  logicalAddress):
+    @property
+    def memory(self):
+        return self.__memory
+
+    @property
+    def is_paged(self):
+        """ Answers if the MMU translates through page tables. """
+        return False
+
+    @property
+    def registers(self):
+        """ Returns the name and value of each registry of the MMU, for printing. """
+        return [["Base", self.__baseDir], ["Limit", self.__limit]]
+
+    def translate(self,  logicalAddress):
         if (logicalAddress >= self.__limit):
             raise Exception("Invalid Address,  {logicalAddress} is higher than process limit: {limit}".format(limit = self.__limit, logicalAddress = logicalAddress))
 
-        physicalAddress = logicalAddress + self.__baseDir
+        return logicalAddress + self.__baseDir
+
+    def contiguous_range(self, logicalAddress):
+        """
+        Returns the physical address of the given logical one, and the
+        physical address where the memory that follows it, contiguous,
+        stops belonging to the process. Unlike translate, it's only a
+        query, so it leaves no trace in the MMU.
+        """
+        return logicalAddress + self.__baseDir, self.__baseDir + self.__limit
+
+    def skip_translations(self, logicalAddress, times):
+        """
+        Account for the translations of the given number of addresses,
+        from the given one, that were skipped. All of them are in the
+        contiguous range of the given address.
+        Nothing to account for when translating by base and limit.
+        """
+        pass
+
+    def fetch(self,  logicalAddress):
+        physicalAddress = self.translate(logicalAddress)
         return self.__memory.read(physicalAddress)
 
     def place(self,  logicalAddress, value):
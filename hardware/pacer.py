@@ -0,0 +1,107 @@
+from time import perf_counter, sleep
+
+from utilities.printer import Printer
+
+# Below this amount of seconds before a deadline, the pacer stops sleeping
+# and busy-waits, as the OS can't be trusted to wake us up on time.
+DEFAULT_SPIN_THRESHOLD = 0.002
+# If a tick starts this many periods late, the pacer gives up on catching
+# up and starts counting periods again from the current time.
+DEFAULT_MAX_LAG_PERIODS = 10
+
+class Pacer:
+    """
+    Paces a loop to run at a fixed period in real time.
+    Instead of sleeping a fixed delay after each iteration (so the real
+    period is the delay plus the time it took to do the work), each
+    iteration is scheduled against a deadline on a monotonic clock, so
+    the time spent working is absorbed by the wait. Waits are done with
+    a sleep for the bulk of the time, and a busy-wait for the last part,
+    which allows periods below a millisecond.
+    It also measures how well it is keeping up, that is, the jitter (how
+    late each iteration started) and the achieved iterations per second.
+    """
+
+    def __init__(self, period, spin_threshold = DEFAULT_SPIN_THRESHOLD, max_lag_periods = DEFAULT_MAX_LAG_PERIODS):
+        self.__period = period
+        self.__spin_threshold = spin_threshold
+        self.__max_lag = period * max_lag_periods
+        self.restart()
+
+    @property
+    def period(self):
+        """ Returns the period, in seconds. """
+        return self.__period
+
+    @property
+    def ticks(self):
+        """ Returns the number of waits performed since the last restart. """
+        return self.__ticks
+
+    @property
+    def overruns(self):
+        """ Returns how many times the pacer fell too far behind and had to start over. """
+        return self.__overruns
+
+    @property
+    def achieved_ticks_per_second(self):
+        """ Returns the measured ticks per second since the last restart. """
+        elapsed = self.__last_wake_up - self.__start_time if self.__ticks > 0 else 0
+        return self.__ticks / elapsed if elapsed > 0 else 0
+
+    @property
+    def mean_jitter(self):
+        """ Returns the mean delay, in seconds, between a deadline and the actual wake up. """
+        return self.__total_jitter / self.__ticks if self.__ticks > 0 else 0
+
+    @property
+    def max_jitter(self):
+        """ Returns the maximum delay, in seconds, between a deadline and the actual wake up. """
+        return self.__max_jitter
+
+    def restart(self):
+        """ Forget the statistics, and start counting periods again from the next wait. """
+        self.__deadline = None
+        self.__start_time = None
+        self.__last_wake_up = None
+        self.__ticks = 0
+        self.__overruns = 0
+        self.__total_jitter = 0
+        self.__max_jitter = 0
+
+    def wait(self):
+        """ Wait until the next period begins. """
+        now = perf_counter()
+        if (self.__deadline is None):
+            # First wait, the current period started now
+            self.__start_time = now
+            self.__deadline = now + self.__period
+        elif (now - self.__deadline > self.__max_lag):
+            # Too far behind, drop the missed periods
+            self.__overruns += 1
+            self.__deadline = now + self.__period
+        else:
+            self.__deadline += self.__period
+        deadline = self.__deadline
+
+        remaining = deadline - now
+        if (remaining > self.__spin_threshold):
+            sleep(remaining - self.__spin_threshold)
+        now = perf_counter()
+        while (now < deadline):
+            now = perf_counter()
+
+        jitter = now - deadline
+        self.__ticks += 1
+        self.__total_jitter += jitter
+        self.__max_jitter = max(self.__max_jitter, jitter)
+        self.__last_wake_up = now
+
+    def __repr__(self):
+        return Printer.tabulated([
+            ["Target ticks/s", round(1 / self.__period, 2)],
+            ["Achieved ticks/s", round(self.achieved_ticks_per_second, 2)],
+            ["Mean jitter (ms)", round(self.mean_jitter * 1000, 4)],
+            ["Max jitter (ms)", round(self.max_jitter * 1000, 4)],
+            ["Overruns", self.__overruns]
+        ])
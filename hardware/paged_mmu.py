@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+from hardware.mmu import MMU
+
+# The number of translations kept by the TLB of each MMU by default
+DEFAULT_TLB_SIZE = 8
+
+class PagedMMU(MMU):
+    """
+    Emulates a Memory Management Unit that translates through pages.
+    The logical memory of a process is split in pages, and the physical
+    memory in frames, both of the same size. The page table of the process
+    tells the frame where each page is, or None if the page is not in
+    memory, so a process does not need to be contiguous in physical memory.
+    Reading the page table on each access would be slow, so the last
+    translations are kept in the TLB (Translation Lookaside Buffer), a
+    small cache that is searched all at once. When full, the translation
+    used the longest ago is discarded.
+    """
+
+    def __init__(self, memory, page_size, tlb_size = DEFAULT_TLB_SIZE, accessed_frames = None):
+        super().__init__(memory)
+        # A bit for each frame, shared by all MMUs, set each time
+        # the page table is read to translate into that frame
+        self.__accessed_frames = accessed_frames
+        self.__page_size = page_size
+        self.__page_table = []
+        self.__tlb_size = tlb_size
+        # From page to frame, the most recently used last
+        self.__tlb = OrderedDict()
+        self.__tlb_hits = 0
+        self.__tlb_misses = 0
+
+    @property
+    def is_paged(self):
+        return True
+
+    @property
+    def page_size(self):
+        """ Returns the size of pages and frames. """
+        return self.__page_size
+
+    @property
+    def page_table(self):
+        """ Returns the page table of the running process. """
+        return self.__page_table
+
+    @page_table.setter
+    def page_table(self, page_table):
+        self.__page_table = page_table
+
+    @property
+    def tlb_hits(self):
+        """ Returns the number of translations found in the TLB. """
+        return self.__tlb_hits
+
+    @property
+    def tlb_misses(self):
+        """ Returns the number of translations not found in the TLB, that read the page table. """
+        return self.__tlb_misses
+
+    @property
+    def registers(self):
+        return [
+            ["Limit", self.limit],
+            ["Pages", len(self.__page_table)],
+            ["TLB hits", self.__tlb_hits],
+            ["TLB misses", self.__tlb_misses]
+        ]
+
+    def flush_tlb(self):
+        """ Forget every translation, as they belong to another process. """
+        self.__tlb.clear()
+
+    def invalidate_page(self, page):
+        """ Forget the translation of a page, as it's no longer in the frame it was. """
+        self.__tlb.pop(page, None)
+
+    def page_of(self, logicalAddress):
+        """ Returns the page of the given logical address. """
+        return logicalAddress // self.__page_size
+
+    def translate(self, logicalAddress):
+        """
+        Returns the physical address of the given logical one,
+        or None if its page is not in memory.
+        """
+        if (logicalAddress >= self.limit):
+            raise Exception("Invalid Address,  {logicalAddress} is higher than process limit: {limit}".format(limit = self.limit, logicalAddress = logicalAddress))
+        page, offset = divmod(logicalAddress, self.__page_size)
+        frame = self.__tlb.get(page)
+        if (frame is None):
+            self.__tlb_misses += 1
+            frame = self.__page_table[page]
+            if (frame is None):
+                return None
+            if (self.__accessed_frames is not None):
+                self.__accessed_frames[frame] = 1
+            self.__tlb[page] = frame
+            if (len(self.__tlb) > self.__tlb_size):
+                self.__tlb.popitem(last=False)
+        else:
+            self.__tlb_hits += 1
+            self.__tlb.move_to_end(page)
+        return frame * self.__page_size + offset
+
+    def contiguous_range(self, logicalAddress):
+        # Contiguous up to the end of the page, or of the process
+        page, offset = divmod(logicalAddress, self.__page_size)
+        if (self.__page_table[page] is None):
+            return None, None
+        frame_start = self.__page_table[page] * self.__page_size
+        page_end = min(self.__page_size, self.limit - page * self.__page_size)
+        return frame_start + offset, frame_start + page_end
+
+    def skip_translations(self, logicalAddress, times):
+        if (times > 0):
+            # The first one as any other, the rest are in the same page, so they hit
+            self.translate(logicalAddress)
+            self.__tlb_hits += times - 1
+
+    def place(self, logicalAddress, value):
+        return self.memory.write(self.translate(logicalAddress), value)
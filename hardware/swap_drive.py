@@ -0,0 +1,38 @@
+import mmap
+import tempfile
+
+class SwapDrive:
+    """
+    Models the drive where the pages that are not in memory are kept.
+    It's backed by a local file, mapped in memory, so it's read and
+    written as any memory, by the operating system. If no path is given,
+    a temporary file is used, which is deleted when the drive is closed.
+    """
+
+    def __init__(self, size, path = None):
+        self.__size = size
+        self.__file = tempfile.TemporaryFile() if path is None else open(path, "w+b")
+        self.__file.truncate(size)
+        self.__cells = mmap.mmap(self.__file.fileno(), size)
+
+    @property
+    def size(self):
+        """ Returns the size of the drive. """
+        return self.__size
+
+    def read(self, addr):
+        """ Returns the value (an opcode) stored at a given address. """
+        return self.__cells[addr]
+
+    def read_block(self, addr, size):
+        """ Returns the values stored from a given address, as bytes. """
+        return self.__cells[addr:addr + size]
+
+    def write_block(self, addr, data):
+        """ Write many values (any bytes-like object of opcodes) starting at a given address. """
+        self.__cells[addr:addr + len(data)] = data
+
+    def close(self):
+        """ Close the drive, and its file. """
+        self.__cells.close()
+        self.__file.close()
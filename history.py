@@ -1,7 +1,5 @@
 from utilities.printer import Printer
 
-from hardware.hardware import HARDWARE
-
 class History:
     def __init__(self, os):
         self.__os = os
@@ -9,27 +7,76 @@ class History:
         self.__process_status_over_time = []
         self.__ticks_registered = 0
         self.__last_max_pid_seen = 0
-        HARDWARE.clock.add_subscriber(self, 0)
+        os.hardware.clock.add_subscriber(self, 0)
 
     def tick(self, tick_number):
-        # Register a new tick
-        self.__ticks_registered += 1
+        self.__register_ticks(1)
+
+    def quiet_ticks(self):
+        # The history only records, it never changes anything
+        return float("inf")
+
+    def skip_ticks(self, ticks, tick_number):
+        # Nothing changed during the skipped ticks, so all of them
+        # look exactly as the current one
+        self.__register_ticks(ticks)
+
+    def __register_ticks(self, ticks):
+        # Register the new ticks
+        self.__ticks_registered += ticks
 
         # Check if there is a new max process ID
         self.__last_max_pid_seen = self.__os.process_table.last_used_pid
 
-        # Register the current process using the CPU at this tick
-        pid = self.__os.scheduler.currently_running_pid
-        self.__cpu_per_process_over_time.append(pid)
+        # Register the current process using each CPU core at these ticks
+        pids = self.__os.scheduler.running_pids
+        self.__cpu_per_process_over_time.extend([pids] * ticks)
 
-        # Register the status of all processes in existence for this tick
-        self.__process_status_over_time.append([])
+        # Register the status of all processes in existence for these ticks
+        status = []
         for i in range(0, self.__last_max_pid_seen):
             if self.__os.process_table.has_pid(i+1):
                 pcb = self.__os.process_table.get_pcb_by_pid(i+1)
-                self.__process_status_over_time[-1].append(pcb.state)
+                status.append(pcb.state)
             else:
-                self.__process_status_over_time[-1].append('--')
+                status.append('--')
+        self.__process_status_over_time.extend([list(status) for _ in range(ticks)])
+
+    def summary(self):
+        """
+        Returns a dictionary with compact metrics of the execution so far,
+        useful to compare runs without rendering the whole history.
+        A process is considered finished once it's gone from the table.
+        """
+        arrivals = {}
+        finishes = {}
+        ready_ticks = {}
+        for tick, status in enumerate(self.__process_status_over_time):
+            for i, state in enumerate(status):
+                pid = i+1
+                if state == '--':
+                    if pid in arrivals and pid not in finishes:
+                        finishes[pid] = tick
+                    continue
+                arrivals.setdefault(pid, tick)
+                if state == 'READY':
+                    ready_ticks[pid] = ready_ticks.get(pid, 0) + 1
+
+        busy_ticks = sum(
+            1 for pids in self.__cpu_per_process_over_time for pid in pids if pid is not None
+        )
+        core_ticks = self.__ticks_registered * self.__os.scheduler.number_of_cores
+        turnarounds = [finishes[pid] - arrivals[pid] for pid in finishes]
+        waitings = [ready_ticks.get(pid, 0) for pid in finishes]
+        return {
+            'ticks': self.__ticks_registered,
+            'processes': len(arrivals),
+            'finished': len(finishes),
+            'throughput': len(finishes) / self.__ticks_registered if self.__ticks_registered > 0 else 0,
+            'cpu_utilization': busy_ticks / core_ticks if core_ticks > 0 else 0,
+            'avg_turnaround': sum(turnarounds) / len(turnarounds) if turnarounds else None,
+            'avg_waiting': sum(waitings) / len(waitings) if waitings else None,
+        }
 
     def to_string(self, columns = None):
         process_per_tick = []
@@ -43,24 +90,29 @@ class History:
                 status_per_tick.append([])
 
             e = self.__cpu_per_process_over_time[i]
-            process_per_tick[-1].append((str(e) if e != None else 'IDLE', i))
+            process_per_tick[-1].append(([str(pid) if pid != None else 'IDLE' for pid in e], i))
 
             f = self.__process_status_over_time[i]
             status_per_tick[-1].append((f, i))
 
             elements_added += 1
 
+        # There is one row per CPU core, labeled PID if there is only one
+        number_of_cores = self.__os.scheduler.number_of_cores
+        labels = ['PID'] if number_of_cores == 1 else ['CPU ' + str(c) for c in range(0, number_of_cores)]
         pprocess_per_tick = []
         if len(process_per_tick) > 0:
             for row in process_per_tick:
-                pair = ([str(e) for (e, i) in row], ['Tick ' + str(i) for (e, i) in row])
-                pair[0].insert(0, 'PID')
+                rows = []
+                for c in range(0, number_of_cores):
+                    rows.append([labels[c]] + [e[c] for (e, i) in row])
+                pair = (rows, ['Tick ' + str(i) for (e, i) in row])
                 pair[1].insert(0, '')
                 pprocess_per_tick.append(pair)
 
         cpu_usage = "\n".join(
             [
-                Printer.tabulated([row[0]],
+                Printer.tabulated(row[0],
                                   headers=row[1])
                 for row in pprocess_per_tick
             ]
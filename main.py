@@ -2,14 +2,11 @@
 import traceback
 from cmd import Cmd
 
-from history import History
+from simulation import Simulation
 
 from utilities.printer import Printer
-from utilities.compiler import Compiler
-
-from hardware.hardware import HARDWARE
-
-from operating_system.kernel import Kernel
+from utilities.program_cache import ProgramCache
+from utilities.program_image import ProgramImage, IMAGE_EXTENSION
 
 class HardwareManagementCLIApp(Cmd):
 
@@ -17,30 +14,72 @@ class HardwareManagementCLIApp(Cmd):
     _memory_size=30
     _clock_speed=1  
     _io_device_timings=[1, 2]
+    _number_of_cores=1
+    # Set a seed to choose the same IO devices on every run
+    _seed=None
+    # One of 'uniform', 'weighted' or 'round_robin'
+    _io_selection='uniform'
+    # Only used by the weighted IO selection, one weight per device
+    _io_weights=None
+    # Set a page size to page memory, None to load each program contiguous
+    _page_size=None
+    # The number of translations each MMU keeps when paging
+    _tlb_size=8
+    # When paging, set a swap size to bring pages to memory only when needed,
+    # so programs may need more memory than there is. The swap drive is
+    # backed by the swap file, or by a temporary file if None
+    _swap_size=0
+    _swap_file=None
+    # Keep memory in a memory map, for very large memories. If a memory file
+    # is given, the cells are kept in it after the app exits, but not the
+    # processes nor the rest of the OS, so it's only backing storage. The
+    # app does not start with a file that still has cells of a previous run,
+    # that is, one that was closed before every process finished
+    _mapped_memory=False
+    _memory_file=None
     ############### END HARDWARE CONFIGURATION AND BEHAVIOR ########################
 
     ############### OS CONFIGURATION AND BEHAVIOR ########################
     #### ESTO LO ESTAMOS CAMBIANDO, ERA FCFS 
     _scheduler_algorithm='FCFS'
     _quantum=0
+    # One of 'FirstFit', 'BestFit', 'WorstFit' or 'Buddy'
+    _memory_algorithm='FirstFit'
+    # Compact memory when the external fragmentation is above this (from 0
+    # to 1), or when a program only fits by compacting. None to never compact
+    _compaction_threshold=1
+    # When swapping, one of 'FIFO', 'CLOCK' or 'OPT'
+    _page_replacement='FIFO'
     ############### END OS CONFIGURATION AND BEHAVIOR ########################
 
     ############### MANAGER CONFIGURATION AND BEHAVIOR ########################
     _showing_ticks = False
     _start_in_turbo_mode=True
+    # Skip the ticks where nothing happens when running several ticks
+    _start_in_fast_forward_mode=False
+    # Give up running until all processes terminate after this many ticks
+    _max_ticks_per_run=10000
     # Automatically run tests at startup
     _automatically_run__tests=[1]
     # If none, print to console, else, print the
     # output to a file
     _history_output_file='out.txt'
+    # How many compiled programs are kept in memory
+    _program_cache_size=64
+    # If not none, compiled programs are also stored in
+    # this folder, and reused between runs of the app
+    _program_cache_folder=None
     ############### END MANAGER CONFIGURATION AND BEHAVIOR ########################
 
     ############### CLI APP CONFIGURATION ########################
 
     prompt = "Hardware >> "
     intro = "Welcome to the hardware manager. Type 'help' for available commands."
+    simulation = None
+    hardware = None
     os = None
     history = None
+    program_cache = None
 
     def preloop(self):
         """
@@ -51,28 +90,46 @@ class HardwareManagementCLIApp(Cmd):
         # Initialize the Printer
         Printer.initialize()
 
-        # Initialize the hardware
-        HARDWARE.setup(
+        # Initialize the hardware, and the Operating System running on it.
+        # The history helps us in visualizing how the execution happened,
+        # is not part of the hardware nor the os, but just a mean to print
+        # data over time
+        self.simulation = Simulation(
             memory_size=self._memory_size,
             clock_speed=self._clock_speed,
-            device_timings= self._io_device_timings
+            device_timings= self._io_device_timings,
+            number_of_cores=self._number_of_cores,
+            seed=self._seed,
+            io_selection=self._io_selection,
+            io_weights=self._io_weights,
+            page_size=self._page_size,
+            tlb_size=self._tlb_size,
+            swap_size=self._swap_size,
+            swap_path=self._swap_file,
+            mapped_memory=self._mapped_memory,
+            memory_path=self._memory_file,
+            scheduling_strategy=self._scheduler_algorithm,
+            quantum=self._quantum,
+            memory_algorithm=self._memory_algorithm,
+            compaction_threshold=self._compaction_threshold,
+            page_replacement=self._page_replacement
         )
+        self.hardware = self.simulation.hardware
+        self.os = self.simulation.kernel
+        self.history = self.simulation.history
 
-        # Initialize the Operating System
-        self.os = Kernel(scheduling_strategy=self._scheduler_algorithm, quantum=self._quantum)
-
-        # The history helps us in visualizing how the
-        # execution happened, is not part of the hardware nor
-        # the os, but just a mean to print data over time
-        self.history = History(self.os)
+        # Programs are compiled once, and reused while their file does not change
+        self.program_cache = ProgramCache(self._program_cache_size, self._program_cache_folder)
 
         # We subscribe, in order to print after every tick the
         # hardware status.
-        HARDWARE.clock.add_subscriber(self)
+        self.hardware.clock.add_subscriber(self)
 
         # Adjust speed if starting in turbo mode
         if (self._start_in_turbo_mode):
-            HARDWARE.clock.overclock()
+            self.hardware.clock.overclock()
+        if (self._start_in_fast_forward_mode):
+            self.hardware.clock.fast_forward()
         for test in self._automatically_run__tests:
             self.__class__.__dict__['test_' + str(test)].__call__(self)
 
@@ -84,7 +141,7 @@ class HardwareManagementCLIApp(Cmd):
         self.do_load('cpu_medium')
         self.do_tick(4)
         self.do_load('cpu_short')
-        self.do_tick(25)
+        self.do_run()
         self.do_history()
 
     def test_2(self):
@@ -97,11 +154,13 @@ class HardwareManagementCLIApp(Cmd):
         self.do_load('p4', 4)
         self.do_tick(2)
         self.do_load('p5', 1)
-        self.do_tick(12)
+        self.do_run()
         self.do_history()
 
     def do_quit(self, line = None):
         """ Exit the application. """
+        # Store the memory in its file, if any, and close it
+        self.hardware.close()
         return True
 
     ############### END CLI APP CONFIGURATION ########################
@@ -111,34 +170,52 @@ class HardwareManagementCLIApp(Cmd):
     def do_on(self, line = None):
         """ Turn ON the computer. """
         Printer.show(" ---- TURNING COMPUTER ON ---- ")
-        HARDWARE.turn_on()
+        self.hardware.turn_on()
 
     def do_off(self, line = None):
         """ Turn OFF the computer. """
-        HARDWARE.turn_off()
+        self.hardware.turn_off()
+        # The memory stays open, as the computer may be turned on again
+        self.hardware.memory.flush()
         Printer.show(" ---- TURNING COMPUTER OFF ---- ")
 
     def do_turbo_on(self, line = None):
         """ Turn ON turbo mode. """
         # Turbo sets the speed of the clock to immediate mode,
         # this is usefull when running ticks manually for debugging
-        HARDWARE.clock.overclock()
+        self.hardware.clock.overclock()
         Printer.show(" ---- STARTING TURBO MODE ---- ")
 
     def do_turbo_off(self, line = None):
         """ Turn OFF turbo mode. """
         # Set the speed back to original value
-        HARDWARE.clock.reset()
+        self.hardware.clock.reset()
         Printer.show(" ---- ENDING TURBO MODE ---- ")
 
+    def do_fast_forward_on(self, line = None):
+        """ Turn ON fast-forward mode. """
+        # Fast-forward jumps over the ticks where nothing observable
+        # happens, this is usefull for long runs waiting on IO
+        self.hardware.clock.fast_forward()
+        Printer.show(" ---- STARTING FAST-FORWARD MODE ---- ")
+
+    def do_fast_forward_off(self, line = None):
+        """ Turn OFF fast-forward mode. """
+        self.hardware.clock.step_by_step()
+        Printer.show(" ---- ENDING FAST-FORWARD MODE ---- ")
+
     def do_status(self, line = None):
         """ Show the hardware status. """
-        data = Printer.tabulated([[HARDWARE, self.os]],
+        data = Printer.tabulated([[self.hardware, self.os]],
             headers=["Hardware", "Operating System"],
             numalign="center", stralign="left"
         )
         Printer.show(data)
 
+    def do_clock_stats(self, line = None):
+        """ Show how well the clock is keeping its speed in real time. """
+        Printer.show(self.hardware.clock.pacer)
+
     def do_history(self, line = None):
         """ Show the hardware status. """
         if self._history_output_file is None:
@@ -165,8 +242,20 @@ class HardwareManagementCLIApp(Cmd):
         elif (type(line) == int):
             ticks = line
 
-        for _ in range(ticks):
-            HARDWARE.clock.tick()
+        self.hardware.clock.run(ticks)
+
+    def do_run(self, line = None):
+        """
+        Run the clock until all the loaded processes have TERMINATED.
+        Optionally, the maximum number of ticks to run can be given.
+        """
+        max_ticks = self._max_ticks_per_run
+        if (type(line) == str and line != "" and line.isdigit()):
+            max_ticks = int(line)
+
+        finished = self.simulation.run_until_all_terminated(max_ticks)
+        if (not finished):
+            Printer.error("Processes still running after {ticks} ticks.".format(ticks=max_ticks))
 
     def do_show_ticks(self, line = None):
         """ Show the hardware status. """
@@ -186,26 +275,41 @@ class HardwareManagementCLIApp(Cmd):
             Printer.show("        --------------- tick: {tick_number} ---------------".format(tick_number = tick_number))
             self.do_status("")
 
+    def quiet_ticks(self):
+        """
+        The status is printed on every tick while showing ticks,
+        so no tick can be skipped then.
+        """
+        return 0 if self._showing_ticks else float("inf")
+
+    def skip_ticks(self, ticks, tick_number):
+        """ Nothing to do, as nothing is printed on skipped ticks. """
+        pass
+
     ############### END SIMULATE TICKING ########################
 
 
     ############### LOAD PROGRAMS ########################
 
     def do_load(self, line = None):
-        """ Load a program from the ones in the programs folder. """
+        """
+        Load a program from the ones in the programs folder.
+        Either an ASM file, or a program image (ending in .img).
+        """
         try:
             # Get the filename
             filename : str = line.strip()
+            if filename.endswith(IMAGE_EXTENSION):
+                # An already compiled image, it's copied to memory as is
+                with ProgramImage.open('./programs/' + filename) as image:
+                    self.os.load_program(image)
+                return
             if not filename.endswith('.asm'):
                 filename += '.asm'
-            # Open a file with such name from the programs folder
-            file_handle = open('./programs/' + filename)
-            # Read the contents, removing extra spaces and empty lines or comments
-            contents = [line.strip() for line in file_handle.readlines()
-                        if line.strip() != "" and not line.strip().startswith("#")]
-            #
-            program = Compiler.compile(filename, contents)
-            self.os.load_program(program)
+            # Compile the file with such name from the programs folder,
+            # or reuse it if it was already compiled
+            program = self.program_cache.compile_file(filename, './programs/' + filename)
+            self.os.load_program(program, filename)
         except FileNotFoundError:
             Printer.error("No program with the name: " + line + "in the ./programs folder.")
         except SyntaxError:
@@ -0,0 +1,189 @@
+from utilities.printer import Printer
+
+from operating_system.frame_allocator import FrameAllocator
+from operating_system.hole_manager import HoleManager
+from operating_system.page_replacement.fifo_page_replacement import FIFOPageReplacementAlgorithm
+from operating_system.page_replacement.clock_page_replacement import ClockPageReplacementAlgorithm
+from operating_system.page_replacement.optimal_page_replacement import OptimalPageReplacementAlgorithm
+
+class DemandPagedLoader:
+    """
+    The loader used when memory is paged on demand. A program is loaded
+    into the swap drive, and its pages are brought to memory only when
+    needed, that is, on a page fault. When there are no free frames, the
+    page replacement algorithm chooses a page to take out of memory.
+    As programs are never written while running, their pages are always
+    in the swap too, so taking a page out of memory needs no writing back.
+    This way, the programs loaded may need more memory than there is.
+    A page fault costs the tick it happens on. The frame it brings the
+    page to is pinned until the instruction that needed it is run, so
+    the other cores cannot take the page out first. If every frame is
+    pinned, the page waits, and the instruction faults again next tick.
+    """
+
+    def __init__(self, kernel, page_replacement = 'FIFO'):
+        self.__kernel = kernel
+        hardware = kernel.hardware
+        self.__page_size = hardware.page_size
+        self.__frame_allocator = FrameAllocator(hardware.memory.size // self.__page_size)
+        # Each program takes a contiguous block of the swap drive
+        self.__swap_holes = HoleManager(hardware.swap.size)
+        # From each frame in use to the PCB and page in it
+        self.__frame_owners = {}
+        # From each pinned frame to the PID, core and PC of the
+        # instruction that faulted, until that instruction is run
+        self.__pins = {}
+        # We create the list of possible algorithms to use, as the scheduler does.
+        self.__available_page_replacement_algorithms = {
+            'FIFO':  FIFOPageReplacementAlgorithm(kernel),
+            'CLOCK': ClockPageReplacementAlgorithm(kernel),
+            'OPT':   OptimalPageReplacementAlgorithm(kernel),
+        }
+        # Then we keep track of the currently selected algorithm
+        self.__current_algorithm_name = page_replacement
+        self.__current_algorithm = self.__available_page_replacement_algorithms[page_replacement]
+        # The page faults of each process, and the instructions
+        # run by the ones already unloaded
+        self.__page_faults = {}
+        self.__instructions = {}
+
+    @property
+    def current_algorithm_name(self):
+        """ Returns the name of the memory algorithm being used. """
+        return "Paging on demand, " + self.__current_algorithm_name
+
+    @property
+    def current_algorithm(self):
+        """ Returns the page replacement algorithm being used. """
+        return self.__current_algorithm
+
+    @property
+    def frame_allocator(self):
+        """ Returns the allocator of the memory frames. """
+        return self.__frame_allocator
+
+    @property
+    def page_faults(self):
+        """ Returns the number of page faults of each process, by PID. """
+        return dict(self.__page_faults)
+
+    @property
+    def fault_rates(self):
+        """
+        Returns the fault rate of each process, by PID, that is,
+        the number of page faults per instruction run.
+        """
+        rates = {}
+        for pid, page_faults in self.__page_faults.items():
+            if (pid in self.__instructions):
+                instructions = self.__instructions[pid]
+            else:
+                instructions = self.__kernel.process_table.get_pcb_by_pid(pid).current_pc
+            rates[pid] = page_faults / max(1, instructions)
+        return rates
+
+    def empty_page_table(self, size):
+        """ Returns the page table of a program of the given size, before any of its pages is in memory. """
+        return [None] * -(-size // self.__page_size)
+
+    def load(self, program):
+        """
+        Load a given program into the swap drive. Return the location
+        where the first instruction was stored.
+        Fails if there is not enough contiguous space in the swap drive.
+        """
+        hueco = self.__swap_holes.first_fit(program.size)
+        if (hueco is None):
+            raise RuntimeError("Not enough free swap space.")
+        swap_location = self.__swap_holes.take(hueco, program.size)
+        swap = self.__kernel.hardware.swap
+        address = swap_location
+        for chunk in program.chunks():
+            swap.write_block(address, chunk)
+            address += len(chunk)
+        return swap_location
+
+    def load_page(self, pcb, page, core_id):
+        """
+        Bring the given page of the process with the given PCB, running
+        on the given core, to memory, taking another page out of memory
+        if there are no free frames. The frame is pinned until the core
+        runs the instruction that needed the page. If every frame is
+        pinned, the page is not brought yet.
+        """
+        self.__page_faults[pcb.pid] = self.__page_faults.get(pcb.pid, 0) + 1
+        if (self.__frame_allocator.free_frames > 0):
+            frame = self.__frame_allocator.allocate()
+        else:
+            frame = self.__current_algorithm.choose_victim(self.__pinned_frames())
+            if (frame is None):
+                return
+            self.__take_out(frame)
+        page_start = page * self.__page_size
+        page_size = min(self.__page_size, pcb.memory_size - page_start)
+        memory = self.__kernel.hardware.memory
+        memory.write_block(frame * self.__page_size, self.__kernel.hardware.swap.read_block(pcb.memory_start + page_start, page_size))
+        # The rest of the last page is left empty
+        memory.fill(frame * self.__page_size + page_size, self.__page_size - page_size)
+        pcb.page_table[page] = frame
+        self.__frame_owners[frame] = (pcb, page)
+        self.__pins[frame] = (pcb.pid, core_id, self.__kernel.hardware.core(core_id).pc)
+        self.__current_algorithm.page_loaded(frame, pcb, page)
+
+    def invalidate_translations(self, frame):
+        """ Make the MMUs forget the translations into the given frame. """
+        pcb, page = self.__frame_owners[frame]
+        for core in self.__kernel.hardware.cores:
+            if (core.mmu.page_table is pcb.page_table):
+                core.mmu.invalidate_page(page)
+
+    def unload(self, pcb):
+        """
+        Remove a program from memory and from the swap drive, giving
+        back the frames of the pages that are in memory.
+        """
+        memory = self.__kernel.hardware.memory
+        for page, frame in enumerate(pcb.page_table):
+            if (frame is not None):
+                self.__current_algorithm.page_unloaded(frame)
+                del self.__frame_owners[frame]
+                self.__pins.pop(frame, None)
+                # Leave the cells EMPTY, the default value to fill with
+                memory.fill(frame * self.__page_size, self.__page_size)
+                self.__frame_allocator.free(frame)
+                pcb.page_table[page] = None
+        self.__swap_holes.free(pcb.memory_start, pcb.memory_size)
+        self.__page_faults.setdefault(pcb.pid, 0)
+        self.__instructions[pcb.pid] = pcb.pc
+
+    def __pinned_frames(self):
+        """
+        Returns the frames that are still pinned, that is, whose core still
+        runs the process that faulted, and has not run the instruction that
+        faulted yet. The other pins are forgotten.
+        """
+        scheduler = self.__kernel.scheduler
+        hardware = self.__kernel.hardware
+        for frame, (pid, core_id, pc) in list(self.__pins.items()):
+            if (scheduler.running_pid_on(core_id) != pid or hardware.core(core_id).pc != pc):
+                del self.__pins[frame]
+        return self.__pins
+
+    def __take_out(self, frame):
+        """ Take the page in the given frame out of memory, so the frame can be used. """
+        self.invalidate_translations(frame)
+        pcb, page = self.__frame_owners.pop(frame)
+        pcb.page_table[page] = None
+
+    def __repr__(self):
+        page_faults = sum(self.__page_faults.values())
+        return Printer.tabulated([[
+            Printer.tabulated([
+                ["Page size", self.__page_size],
+                ["Free frames", self.__frame_allocator.free_frames],
+                ["Page faults", page_faults],
+                ["Fault rates", ", ".join(
+                    "{pid}: {rate:.2f}".format(pid=pid, rate=rate) for pid, rate in self.fault_rates.items()
+                )]
+            ])
+        ]], headers=["Memory"])
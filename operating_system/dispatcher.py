@@ -1,5 +1,3 @@
-from hardware.hardware import HARDWARE
-
 from operating_system.pcb import RUNNING, READY, WAITING
 
 class Dispatcher:
@@ -10,9 +8,9 @@ class Dispatcher:
     def __init__(self, kernel):
         self.__kernel = kernel
 
-    def load(self, pcb):
+    def load(self, pcb, core_id=0):
         """
-        Load the state of a PCB into the CPU.
+        Load the state of a PCB into the CPU core with the given id.
         Next tick will tart executing the program of the loaded process.
         """
         # TODO: (2)
@@ -20,19 +18,28 @@ class Dispatcher:
         # This implies copying the information stored in the PCB
         # to the corresponding registries in the CPU, so next tick will
         # run the process the PCB represents.
-        HARDWARE.cpu.pc = pcb.pc
-        HARDWARE.mmu.baseDir = pcb.memory_start
-        HARDWARE.mmu.limit = pcb.memory_size
+        core = self.__kernel.hardware.core(core_id)
+        core.pc = pcb.pc
+        pcb.core = core
+        core.mmu.baseDir = pcb.memory_start
+        core.mmu.limit = pcb.memory_size
+        if (pcb.page_table is not None):
+            # Point the MMU to the page table of the process, the
+            # translations of the previous process are no longer valid
+            core.mmu.page_table = pcb.page_table
+            core.mmu.flush_tlb()
 
 
-    def save(self, pcb):
+    def save(self, pcb, core_id=0):
         """
-        Save the current state of the CPU to the given PCB.
-        The CPU remains IDLE into the next load.
+        Save the current state of the CPU core with the given id to the given PCB.
+        The CPU core remains IDLE into the next load.
         """
         # TODO: (2)
         # We need to save the current state of the CPU to the given PCB.
-        pcb.pc = HARDWARE.cpu.pc
+        core = self.__kernel.hardware.core(core_id)
+        pcb.pc = core.pc
+        pcb.core = None
         # This occurrs on a context switch, so after this step, the CPU
         # should be put as IDLE, not running anything.
-        HARDWARE.cpu.pc = -1
+        core.pc = -1
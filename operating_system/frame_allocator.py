@@ -0,0 +1,31 @@
+class FrameAllocator:
+    """
+    Keeps track of the free frames of a paged physical memory. As any
+    free frame is as good as another, they are simply kept in a stack,
+    and taking or giving back one is O(1).
+    """
+
+    def __init__(self, number_of_frames):
+        self.__number_of_frames = number_of_frames
+        # Reversed, so the first frames are used first
+        self.__free_frames = list(range(number_of_frames - 1, -1, -1))
+
+    @property
+    def number_of_frames(self):
+        """ Returns the number of frames of memory. """
+        return self.__number_of_frames
+
+    @property
+    def free_frames(self):
+        """ Returns the number of free frames. """
+        return len(self.__free_frames)
+
+    def allocate(self):
+        """ Take a free frame and return its number. Fails if there is none. """
+        if (not self.__free_frames):
+            raise RuntimeError("There are no free frames.")
+        return self.__free_frames.pop()
+
+    def free(self, frame):
+        """ Give a frame back, so it can be used again. """
+        self.__free_frames.append(frame)
@@ -0,0 +1,242 @@
+from random import Random
+
+from operating_system.hueco import Hueco
+
+class HoleTreap:
+    """
+    The holes, ordered by a key, in a treap: a binary search tree by
+    key that is also a heap by a random priority, which keeps it
+    balanced on average. The key of a hole is computed from its start
+    and size by the given function, so the same treap orders the holes
+    by address, or by size. Each node also knows the size of the
+    largest hole in its subtree, so the first hole (by key) of at least
+    some size is found in O(log n), without visiting the holes that are
+    too small.
+    """
+
+    class Node:
+        """ A node of the treap, with a single hole. """
+
+        def __init__(self, key, start, size, priority):
+            self.key = key
+            self.start = start
+            self.size = size
+            self.priority = priority
+            self.max_size = size
+            self.left = None
+            self.right = None
+
+        def update(self):
+            """ Recalculate the largest size of the subtree, after a child changed. """
+            self.max_size = max(
+                self.size,
+                self.left.max_size if self.left else 0,
+                self.right.max_size if self.right else 0
+            )
+
+    def __init__(self, key):
+        self.__key = key
+        self.__root = None
+        # Always the same priorities, so runs are reproducible
+        self.__random = Random(0)
+
+    def insert(self, start, size):
+        """ Add the hole with the given start and size. """
+        key = self.__key(start, size)
+        node = HoleTreap.Node(key, start, size, self.__random.random())
+        smaller, larger = self.__split(self.__root, key)
+        self.__root = self.__merge(self.__merge(smaller, node), larger)
+
+    def remove(self, start, size):
+        """ Remove the hole with the given start and size. """
+        self.__root = self.__remove(self.__root, self.__key(start, size))
+
+    def first_fit(self, size):
+        """ Returns the start of the first hole with at least the given size, or None if there is none. """
+        node = self.__root
+        while (node is not None and node.max_size >= size):
+            if (node.left is not None and node.left.max_size >= size):
+                node = node.left
+            elif (node.size >= size):
+                return node.start
+            else:
+                node = node.right
+        return None
+
+    def first_from(self, key):
+        """ Returns the start of the first hole whose key is not smaller than the given one, or None if there is none. """
+        node = self.__root
+        found = None
+        while (node is not None):
+            if (node.key < key):
+                node = node.right
+            else:
+                found = node
+                node = node.left
+        return None if found is None else found.start
+
+    def last(self):
+        """ Returns the start of the last hole, or None if there is none. """
+        node = self.__root
+        if (node is None):
+            return None
+        while (node.right is not None):
+            node = node.right
+        return node.start
+
+    @property
+    def max_size(self):
+        """ Returns the size of the largest hole, or zero if there is none. """
+        return self.__root.max_size if self.__root else 0
+
+    def __split(self, node, key):
+        """ Split a subtree into the holes with a key smaller than the given one, and the rest. """
+        if (node is None):
+            return None, None
+        if (node.key < key):
+            node.right, larger = self.__split(node.right, key)
+            node.update()
+            return node, larger
+        smaller, node.left = self.__split(node.left, key)
+        node.update()
+        return smaller, node
+
+    def __merge(self, smaller, larger):
+        """ Merge two subtrees, where every hole of the first one has a smaller key than the ones of the second. """
+        if (smaller is None):
+            return larger
+        if (larger is None):
+            return smaller
+        if (smaller.priority > larger.priority):
+            smaller.right = self.__merge(smaller.right, larger)
+            smaller.update()
+            return smaller
+        larger.left = self.__merge(smaller, larger.left)
+        larger.update()
+        return larger
+
+    def __remove(self, node, key):
+        """ Remove the hole with the given key from a subtree, and return what is left of it. """
+        if (node is None):
+            raise RuntimeError("There is no hole with key {key}".format(key=key))
+        if (node.key == key):
+            return self.__merge(node.left, node.right)
+        if (key < node.key):
+            node.left = self.__remove(node.left, key)
+        else:
+            node.right = self.__remove(node.right, key)
+        node.update()
+        return node
+
+
+class HoleManager:
+    """
+    Keeps track of the holes of the physical memory. The holes are
+    indexed in several ways, so each question is answered quickly:
+        - By start and by end address, in dictionaries, to find the holes
+          right before and after a freed block, and join them with it.
+        - By size (and start, to tell apart holes of the same size) in a
+          treap, to find the smallest hole that is big enough (best fit)
+          or the largest one (worst fit).
+        - By start address in a treap, to find the first hole that is big
+          enough (first fit).
+    Every question, and adding or removing a hole, takes O(log n).
+    """
+
+    def __init__(self, memory_size):
+        self.__memory_size = memory_size
+        self.__by_start = {}
+        self.__by_end = {}
+        self.__by_size = HoleTreap(lambda start, size: (size, start))
+        self.__by_address = HoleTreap(lambda start, size: start)
+        self.__free_memory = 0
+        if (memory_size > 0):
+            self.__add(Hueco(0, memory_size))
+
+    @property
+    def holes(self):
+        """ Returns the holes, ordered by their start address. """
+        return [self.__by_start[start] for start in sorted(self.__by_start)]
+
+    @property
+    def number_of_holes(self):
+        """ Returns the number of holes. """
+        return len(self.__by_start)
+
+    @property
+    def free_memory(self):
+        """ Returns the amount of free memory, adding up every hole. """
+        return self.__free_memory
+
+    @property
+    def largest_hole(self):
+        """ Returns the size of the largest hole, or zero if there is none. """
+        return self.__by_address.max_size
+
+    def first_fit(self, size):
+        """ Returns the first hole, by address, with at least the given size, or None. """
+        start = self.__by_address.first_fit(size)
+        return None if start is None else self.__by_start[start]
+
+    def best_fit(self, size):
+        """ Returns the smallest hole with at least the given size, or None. """
+        start = self.__by_size.first_from((size, -1))
+        return None if start is None else self.__by_start[start]
+
+    def worst_fit(self, size):
+        """ Returns the largest hole, if it has at least the given size, or None. """
+        if (self.largest_hole < size):
+            return None
+        return self.__by_start[self.__by_size.last()]
+
+    def take(self, hueco, size):
+        """
+        Use the first cells of the given hole, what is left of it remains
+        as a smaller hole. Returns the address where the used cells start.
+        """
+        if (size > hueco.size):
+            raise RuntimeError("Cannot take {size} cells from {hueco}".format(size=size, hueco=hueco))
+        self.__remove(hueco)
+        if (size < hueco.size):
+            self.__add(Hueco(hueco.start + size, hueco.size - size))
+        return hueco.start
+
+    def free(self, start, size):
+        """
+        Make the given block of memory a hole again, joining
+        it with the holes right before and after it, if any.
+        """
+        if (start < 0 or start + size > self.__memory_size):
+            raise RuntimeError("Cannot free {size} cells at {start}, out of memory".format(size=size, start=start))
+        if (start in self.__by_start or start + size in self.__by_end):
+            raise RuntimeError("Cannot free {size} cells at {start}, already free".format(size=size, start=start))
+        if (size == 0):
+            return
+        previous_hole = self.__by_end.get(start)
+        if (previous_hole is not None):
+            self.__remove(previous_hole)
+            start, size = previous_hole.start, previous_hole.size + size
+        next_hole = self.__by_start.get(start + size)
+        if (next_hole is not None):
+            self.__remove(next_hole)
+            size += next_hole.size
+        self.__add(Hueco(start, size))
+
+    def __add(self, hueco):
+        """ Add a hole to every index. """
+        self.__by_start[hueco.start] = hueco
+        self.__by_end[hueco.end] = hueco
+        self.__by_size.insert(hueco.start, hueco.size)
+        self.__by_address.insert(hueco.start, hueco.size)
+        self.__free_memory += hueco.size
+
+    def __remove(self, hueco):
+        """ Remove a hole from every index. """
+        del self.__by_start[hueco.start]
+        del self.__by_end[hueco.end]
+        self.__by_size.remove(hueco.start, hueco.size)
+        self.__by_address.remove(hueco.start, hueco.size)
+        self.__free_memory -= hueco.size
+
+    def __repr__(self):
+        return "HoleManager({holes})".format(holes=self.holes)
@@ -1,11 +1,33 @@
+class Hueco:
+    """
+    Models a hole, that is, a block of free contiguous physical memory,
+    given by the address where it starts and its size.
+    """
 
+    def __init__(self, start, size):
+        self.__start = start
+        self.__size = size
 
+    @property
+    def start(self):
+        """ Returns the first address of the hole. """
+        return self.__start
 
+    @property
+    def size(self):
+        """ Returns the number of cells of the hole. """
+        return self.__size
 
-class Hueco:
+    @property
+    def end(self):
+        """ Returns the address right after the last one of the hole. """
+        return self.__start + self.__size
+
+    def __eq__(self, other):
+        return isinstance(other, Hueco) and self.__start == other.start and self.__size == other.size
+
+    def __hash__(self):
+        return hash((self.__start, self.__size))
 
-    # Simularia el espacio en memoria fisica como una lista con bases y limites.
-        
-    def __init__(self):
-        pass
-    
\ No newline at end of file
+    def __repr__(self):
+        return "Hueco({start}, {size})".format(start=self.__start, size=self.__size)
@@ -1,8 +1,6 @@
 from utilities.printer import Printer
 from utilities.queue import Queue
 
-from hardware.hardware import HARDWARE
-
 class IOController:
     """
     The IO Controller class is in charge of managing an IO device, dispatching
@@ -44,7 +42,7 @@ class IOController:
         self.__send_next_request__()
 
     def __send_next_request__(self):
-        device = HARDWARE.io_device(self.__io_device_id)
+        device = self.__kernel.hardware.io_device(self.__io_device_id)
         if (not self.__request_queue.is_empty and device.is_idle):
             self.__currently_running_pid = self.__request_queue.dequeue()
             device.request()
@@ -1,15 +1,13 @@
 from utilities.printer import Printer
 
-from hardware.hardware import HARDWARE
-
 from operating_system.io_controller import IOController
 
 class IOControllersVector:
 
-    def __init__(self):
+    def __init__(self, kernel):
         self.__io_controllers = []
-        for device_id in HARDWARE.io_devices_ids():
-            self.__io_controllers.append(IOController(self, device_id))
+        for device_id in kernel.hardware.io_devices_ids():
+            self.__io_controllers.append(IOController(kernel, device_id))
 
     def get_by_id(self, device_id):
         """ Returns the IO controller for a given device id. """
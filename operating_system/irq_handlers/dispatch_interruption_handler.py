@@ -4,15 +4,19 @@ class DispatchInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
         """
-        Dispatch the next process to the running state.
+        Dispatch the next process to the running state, on the core
+        given as argument, or on every core if none is given.
         """
         preemptive = irq.arguments[0]
-        pid = self.kernel.scheduler.currently_running_pid
-        # As we have The next process in the ready state should be moved
-        # to the running state.
-        if preemptive or (not preemptive and pid == None):
-            if (pid != None):
-                self.kernel.scheduler.move_to_ready(pid)
-            next_pid = self.kernel.scheduler.next_process_id
-            if (next_pid != None):
-                self.kernel.scheduler.move_to_running(next_pid)
\ No newline at end of file
+        core = irq.arguments[1]
+        cores = range(0, self.kernel.scheduler.number_of_cores) if core is None else [core]
+        for core_id in cores:
+            pid = self.kernel.scheduler.running_pid_on(core_id)
+            # As we have The next process in the ready state should be moved
+            # to the running state.
+            if preemptive or (not preemptive and pid == None):
+                if (pid != None):
+                    self.kernel.scheduler.move_to_ready(pid)
+                next_pid = self.kernel.scheduler.next_process_id
+                if (next_pid != None):
+                    self.kernel.scheduler.move_to_running(next_pid, core_id)
\ No newline at end of file
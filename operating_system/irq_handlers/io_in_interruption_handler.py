@@ -1,4 +1,3 @@
-from hardware.hardware import HARDWARE
 from hardware.irq import IRQ
 
 from operating_system.irq_handlers.abstract_interruption_handler import AbstractInterruptionHandler
@@ -12,11 +11,13 @@ class IoInInterruptionHandler(AbstractInterruptionHandler):
         """
         # The device that was requested for use can be retrieved from the arguments.
         device = irq.arguments[0]
+        # As well as the core that was running the process
+        core = irq.arguments[1]
         # TODO: (4)
         # The current process needs to be changed to waiting state,
         # and the request be dispatched.
-        # First we need to get the currently running process id
-        pid = self.kernel.scheduler.currently_running_pid
+        # First we need to get the process id currently running on the core
+        pid = self.kernel.scheduler.running_pid_on(core)
         # Next, we have to move the process to waiting state
         self.kernel.scheduler.move_to_waiting(pid)
         # After the process is in waiting state, we need to send the
@@ -24,6 +25,6 @@ class IoInInterruptionHandler(AbstractInterruptionHandler):
         self.kernel.io_controllers_vector.get_by_id(device).request(pid)
         # As the currently running process is now in waiting state,
         # the last step is to tell the scheduler to run the next process
-        # in the ready queue, if any.
-        HARDWARE.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
+        # in the ready queue, if any, on the core that was freed.
+        self.kernel.hardware.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive, core))
 
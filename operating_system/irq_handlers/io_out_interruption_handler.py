@@ -1,4 +1,3 @@
-from hardware.hardware import HARDWARE
 from hardware.irq import IRQ
 
 from operating_system.irq_handlers.abstract_interruption_handler import AbstractInterruptionHandler
@@ -30,4 +29,4 @@ class IoOutInterruptionHandler(AbstractInterruptionHandler):
         # in the ready queue, it may happen that it also needs to be run,
         # the last step is to tell the scheduler to run the next process
         # in the ready queue, if any.
-        HARDWARE.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
\ No newline at end of file
+        self.kernel.hardware.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
\ No newline at end of file
@@ -1,4 +1,3 @@
-from hardware.hardware import HARDWARE
 from hardware.irq import IRQ
 
 from operating_system.irq_handlers.abstract_interruption_handler import AbstractInterruptionHandler
@@ -6,9 +5,11 @@ from operating_system.irq_handlers.abstract_interruption_handler import Abstract
 class KillInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
-        """ Kill the currently running process. """
-        # We can get the PID of the current process running
-        pid = self.kernel.scheduler.currently_running_pid
+        """ Kill the process currently running on the core that raised the interruption. """
+        # The core that executed the EXIT instruction is given as an argument
+        core = irq.arguments[0]
+        # We can get the PID of the current process running on that core
+        pid = self.kernel.scheduler.running_pid_on(core)
         # Then we move the process to terminated state
         self.kernel.scheduler.move_to_terminated(pid)
         # Now we can unload the process from memory and remove
@@ -17,5 +18,5 @@ class KillInterruptionHandler(AbstractInterruptionHandler):
         # TODO: (3)
         # As the currently running process is now in terminated state,
         # the last step is to tell the scheduler to run the next process
-        # in the ready queue, if any.
-        HARDWARE.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
\ No newline at end of file
+        # in the ready queue, if any, on the core that was freed.
+        self.kernel.hardware.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive, core))
\ No newline at end of file
@@ -1,4 +1,3 @@
-from hardware.hardware import HARDWARE
 from hardware.irq import IRQ
 
 from operating_system.irq_handlers.abstract_interruption_handler import AbstractInterruptionHandler
@@ -12,8 +11,10 @@ class NewInterruptionHandler(AbstractInterruptionHandler):
         """
         # The program is given as an argument of this IRQ.
         program = irq.arguments[0]
+        # As well as the name of the process, if it's not the program's one
+        name = irq.arguments[2]
         # Perform the basic system calls
-        pid = self.kernel._create_process(program)
+        pid = self.kernel._create_process(program, name)
         # The new state is quite transient. When a process is created
         # it should immediately be set to the READY state and put in
         # the ready queue. The scheduler is in charge of this.
@@ -21,4 +22,4 @@ class NewInterruptionHandler(AbstractInterruptionHandler):
         # If there is no process running, most likely there is no
         # other process to execute, so move the next process to the
         # running state
-        HARDWARE.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
+        self.kernel.hardware.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
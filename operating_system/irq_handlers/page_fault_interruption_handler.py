@@ -0,0 +1,19 @@
+from operating_system.irq_handlers.abstract_interruption_handler import AbstractInterruptionHandler
+
+class PageFaultInterruptionHandler(AbstractInterruptionHandler):
+
+    def execute(self, irq):
+        """
+        The current process needs a page that is not in memory.
+        We need to bring it from the swap drive, so the process can go on.
+        """
+        # The page that was needed can be retrieved from the arguments.
+        page = irq.arguments[0]
+        # As well as the core that was running the process
+        core = irq.arguments[1]
+        pid = self.kernel.scheduler.running_pid_on(core)
+        pcb = self.kernel.process_table.get_pcb_by_pid(pid)
+        # The loader brings the page, taking out another one if memory
+        # is full. The process keeps running, and the instruction that
+        # failed is fetched again on the next tick, now from memory.
+        self.kernel.loader.load_page(pcb, page, core)
@@ -1,4 +1,3 @@
-from hardware.hardware import HARDWARE
 from hardware.irq import IRQ
 
 from operating_system.irq_handlers.abstract_interruption_handler import AbstractInterruptionHandler
@@ -8,17 +7,22 @@ class SwapInterruptionHandler(AbstractInterruptionHandler):
     def execute(self, irq):
         """
         Remove the currently running process and swap it for
-        the next process in the ready state.
+        the next process in the ready state. If a core is given
+        as argument, only that core is swapped, otherwise, all are.
         """
+        core = irq.arguments[0]
+        cores = range(0, self.kernel.scheduler.number_of_cores) if core is None else [core]
         # TODO: (5)
         # We are handling preemption here. So we need to swap the
         # currently executing in the CPU, by the one next in the queue.
-        # First, lets get the process running
-        pid = self.kernel.scheduler.currently_running_pid
-        # Now, let's move this process to ready state, as it can actually
-        # still run, it's the OS who is telling it not to continue.
-        self.kernel.scheduler.move_to_ready(pid)
+        for core_id in cores:
+            # First, lets get the process running
+            pid = self.kernel.scheduler.running_pid_on(core_id)
+            # Now, let's move this process to ready state, as it can actually
+            # still run, it's the OS who is telling it not to continue.
+            if (pid != None):
+                self.kernel.scheduler.move_to_ready(pid)
         # Once in ready, we have to load the next process in the ready queue.
         # Not that, if there is only one process, it will be the same
         # process that we load.
-        HARDWARE.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive))
+        self.kernel.hardware.interrupt_vector.handle(IRQ.DISPATCH(self.kernel.scheduler.current_algorithm.is_preemptive, core))
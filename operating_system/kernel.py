@@ -1,11 +1,12 @@
 from utilities.printer import Printer
 
-from hardware.hardware import HARDWARE
 from hardware.irq import *
 
 from operating_system.pcb import PCB
 from operating_system.process_table import ProcessTable
 from operating_system.loader import Loader
+from operating_system.paged_loader import PagedLoader
+from operating_system.demand_paged_loader import DemandPagedLoader
 from operating_system.scheduler import Scheduler
 from operating_system.dispatcher import Dispatcher
 from operating_system.io_controllers_vector import IOControllersVector
@@ -15,11 +16,17 @@ from operating_system.irq_handlers.io_in_interruption_handler import IoInInterru
 from operating_system.irq_handlers.io_out_interruption_handler import IoOutInterruptionHandler
 from operating_system.irq_handlers.swap_interruption_handler import SwapInterruptionHandler
 from operating_system.irq_handlers.dispatch_interruption_handler import DispatchInterruptionHandler
+from operating_system.irq_handlers.page_fault_interruption_handler import PageFaultInterruptionHandler
 
 class Kernel:
     """ Models the kernel of the OS. """
 
-    def __init__(self, scheduling_strategy = 'FCFS', quantum = 0):
+    def __init__(self, hardware, scheduling_strategy = 'FCFS', quantum = 0, memory_algorithm = 'FirstFit',
+                 compaction_threshold = 1, page_replacement = 'FIFO'):
+        # The hardware the OS runs on. Every part of the OS reaches the
+        # hardware through the kernel, so many machines, each one with its
+        # own OS, can live side by side.
+        self.__hardware = hardware
         # The process table holds all the PCB's, it contains information
         # of all the processes currently alive in the system. It also holds
         # other additional behavior, such as answering which is the next PID.
@@ -29,7 +36,18 @@ class Kernel:
         # should perform heuristics to determine if it's a good time or not
         # to add a process, and when it should be added. Instead, we are going
         # to pursue a simpler approach. Our LTS was currently only a loader.
-        self.__loader = Loader(self)
+        # The memory algorithm chooses where in memory each program goes,
+        # and the threshold tells when to compact memory. When memory is
+        # paged, programs are loaded page by page, in any free frame. When
+        # there is a swap drive too, programs are loaded there, and each page
+        # is brought to memory when needed, choosing which page to take out
+        # with the page replacement algorithm.
+        if (hardware.swap is not None):
+            self.__loader = DemandPagedLoader(self, page_replacement)
+        elif (hardware.is_paged):
+            self.__loader = PagedLoader(self)
+        else:
+            self.__loader = Loader(self, memory_algorithm, compaction_threshold)
         # The Dispatcher is the part of the OS in charge of switching the
         # context of the CPU from one process to the next. It does not
         # control which process to load, but jut loads and unloads a process.
@@ -40,31 +58,38 @@ class Kernel:
         # executed, which processes are waiting for execution, which are waiting
         # for IO to finish, and so on. It's in charge of performing the
         # context_switch.
-        self.__scheduler = Scheduler(self, scheduling_strategy, quantum)
+        # With several CPU cores, it keeps track of the process on each one.
+        self.__scheduler = Scheduler(self, scheduling_strategy, quantum, hardware.number_of_cores)
         # The IO controllers are the ones that handle the request to each
         # IO device. There is one for each device. The IO controllers vector
         # is the one in charge of retrieving the right controller for a given
         # device id. Although not strictly a part of the OS, this is really
         # convenient for managing and printing.
-        self.__io_controllers_vector = IOControllersVector()
+        self.__io_controllers_vector = IOControllersVector(self)
 
 
 
         # The OS should register a handler for each type of interruption
         # the hardware defines. How to handle the interruptions is up to the
         # operating system.
-        HARDWARE.interrupt_vector.register(NEW_IRQ, NewInterruptionHandler(self))
-        HARDWARE.interrupt_vector.register(KILL_IRQ, KillInterruptionHandler(self))
+        hardware.interrupt_vector.register(NEW_IRQ, NewInterruptionHandler(self))
+        hardware.interrupt_vector.register(KILL_IRQ, KillInterruptionHandler(self))
         # TODO: (3)
         # We need to add a handler for each interruption type. Note
         # that some handlers are not yet finished, so you may need to
         # add them in the extent that you finish them.
-        HARDWARE.interrupt_vector.register(IO_IN_IRQ, IoInInterruptionHandler(self))
-        HARDWARE.interrupt_vector.register(IO_OUT_IRQ, IoOutInterruptionHandler(self))
-        HARDWARE.interrupt_vector.register(SWAP_IRQ, SwapInterruptionHandler(self))
-        HARDWARE.interrupt_vector.register(DISPATCH_IRQ, DispatchInterruptionHandler(self))
+        hardware.interrupt_vector.register(IO_IN_IRQ, IoInInterruptionHandler(self))
+        hardware.interrupt_vector.register(IO_OUT_IRQ, IoOutInterruptionHandler(self))
+        hardware.interrupt_vector.register(SWAP_IRQ, SwapInterruptionHandler(self))
+        hardware.interrupt_vector.register(DISPATCH_IRQ, DispatchInterruptionHandler(self))
+        hardware.interrupt_vector.register(PAGE_FAULT_IRQ, PageFaultInterruptionHandler(self))
 
 
+    @property
+    def hardware(self):
+        """ Returns the hardware the OS runs on. """
+        return self.__hardware
+
     @property
     def process_table(self):
         """ Returns the process table of the OS. """
@@ -90,6 +115,15 @@ class Kernel:
         """ Returns the IO controllers vector. """
         return self.__io_controllers_vector
 
+    @property
+    def all_processes_terminated(self):
+        """
+        Answers if every process loaded so far has TERMINATED. A terminated
+        process is removed from the process table, so that is the case when
+        the table is empty.
+        """
+        return self.__process_table.number_of_processes() == 0
+
     ############### SYSTEM CALLS ########################
 
     # This functions represent the system calls, that is, operations
@@ -101,24 +135,41 @@ class Kernel:
 
     ###### High level:
 
-    def load_program(self, program):
+    def load_program(self, program, name = None):
         """
         Load a new program. That is, create a process for it, and
         set it a ready to run. We achieve this through the use of
-        an IRQ.
+        an IRQ. The process is named as the program, unless
+        another name is given.
         """
         # We achieve this through an IRQ
-        HARDWARE.interrupt_vector.handle(IRQ.NEW(program))
+        self.__hardware.interrupt_vector.handle(IRQ.NEW(program, name=name))
 
     ###### Low level (Should not be called from Main, but only from the OS):
 
-    def _create_process(self, program):
+    def _create_process(self, program, name = None):
         """
-        Create a new process with the associated given program.
+        Create a new process with the associated given program,
+        and the given name, or the program's one.
         Return the created process PID.
         """
-        mem_start = self.__loader.load(program.instructions)
-        pcb = PCB(self.__process_table.get_next_pid(), mem_start, len(program.instructions))
+        name = program.name if name is None else name
+        if (self.__hardware.swap is not None):
+            # The program is read from the swap drive, where it's
+            # contiguous, until its pages are brought to memory
+            swap_start = self.__loader.load(program)
+            pcb = PCB(self.__process_table.get_next_pid(), swap_start, program.size, self.__hardware.swap,
+                      page_table=self.__loader.empty_page_table(program.size), cpu_counts=program.cpu_counts,
+                      name=name)
+        elif (self.__hardware.is_paged):
+            page_table = self.__loader.load(program)
+            pcb = PCB(self.__process_table.get_next_pid(), 0, program.size, self.__hardware.memory,
+                      page_table=page_table, page_size=self.__hardware.page_size, cpu_counts=program.cpu_counts,
+                      name=name)
+        else:
+            mem_start = self.__loader.load(program)
+            pcb = PCB(self.__process_table.get_next_pid(), mem_start, program.size, self.__hardware.memory,
+                      cpu_counts=program.cpu_counts, name=name)
         self.__process_table.add_new_pcb(pcb)
         return pcb.pid
 
@@ -134,12 +185,14 @@ class Kernel:
         os_config = Printer.tabulated([[
             Printer.tabulated([
                 ["Sch. Algorithm", self.__scheduler.current_algorithm_name],
-                ["Quantum", self.__scheduler.current_algorithm.quantum]
+                ["Quantum", self.__scheduler.current_algorithm.quantum],
+                ["Mem. Algorithm", self.__loader.current_algorithm_name]
             ])
         ]], headers=["Configuration"])
 
         return "\n".join([
             os_config,
+            str(self.__loader),
             str(self.__scheduler),
             str(self.__io_controllers_vector),
             str(self.__process_table)
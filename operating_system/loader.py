@@ -1,78 +1,189 @@
-from hardware.hardware import HARDWARE
+from utilities.printer import Printer
+
 from operating_system.memory_algorithms.first_fit_algorithm import FirstFitAlgorithm
+from operating_system.memory_algorithms.best_fit_algorithm import BestFitAlgorithm
+from operating_system.memory_algorithms.worst_fit_algorithm import WorstFitAlgorithm
+from operating_system.memory_algorithms.buddy_algorithm import BuddyAlgorithm
+from operating_system.shared_text_table import SharedTextTable
+
+# How many memory cells a compaction moves on each tick
+COMPACTION_CELLS_PER_TICK = 16
 
 class Loader:
     """
     The loader is in charge of loading programs into memory.
-    Later, the loader may use different, more complex
-    allocation strategies. For now, we use a super simple strategy.
-    The problem with this strategy is that, even if a program is
-    unloaded, the freed memory cannot be used back, yikes.
+    The memory algorithm chooses where each program is loaded, and keeps
+    track of the free memory, so when a program is unloaded its memory
+    can be used by the programs to come.
+    Free memory may end up spread in many small holes, where programs do
+    not fit. When that happens, the loader compacts memory: it moves every
+    loaded program to the start of memory, so all the free memory becomes
+    a single hole. Moving memory takes time: the cores are stalled for
+    a tick every COMPACTION_CELLS_PER_TICK cells moved, so compacting
+    delays every process. The compaction threshold tells when to compact:
+        - None: Never, a program that does not fit in a hole is not loaded.
+        - A fragmentation, from 0 to 1: Before loading a program, if the
+          external fragmentation is above it, or if the program does not fit
+          in any hole but fits in the free memory.
+    A program loaded many times is in memory only once: every process
+    running it shares the same text, which is freed with the last one.
     """
 
-    def __init__(self, kernel, algorithm):
+    def __init__(self, kernel, memory_algorithm = 'FirstFit', compaction_threshold = 1):
         self.__kernel = kernel
-        #self.__next_free_memory_addr = 0
-        self.__current_algorithm = algorithm
-
-
+        self.__compaction_threshold = compaction_threshold
+        # The statistics of the compactions performed
+        self.__compactions = 0
+        self.__compacted_cells = 0
+        self.__compaction_ticks = 0
+        # The texts of the programs loaded, shared by their processes
+        self.__shared_texts = SharedTextTable()
+        memory_size = kernel.hardware.memory.size
+        # We create the list of possible algorithms to use, as the scheduler does.
         self.__available_memory_algorithms = {
-            'FirstFit' : FirstFitAlgorithm(),
-            'WorstFit' : WorstFitAlgorithm(),
-            'BestFit' : BestFitAlgorithm(),
+            'FirstFit': FirstFitAlgorithm(memory_size),
+            'BestFit':  BestFitAlgorithm(memory_size),
+            'WorstFit': WorstFitAlgorithm(memory_size),
+            'Buddy':    BuddyAlgorithm(memory_size),
         }
-        # first fit
-        # best fit
-        # worst fit
-        # es casi que lo mismo que los algoritmos de scheduler :  
-        # self.__available_scheduling_algorithms = {
-        #     'FCFS': FCFSSchedulingAlgorithm(kernel, quantum),
-        #    'LJF':  LJFSchedulingAlgorithm(kernel, quantum),
-        #    'SJF':  SJFSchedulingAlgorithm(kernel, quantum),
-        #    'FPPS': FPPSSchedulingAlgorithm(kernel, quantum),
-        #    'SRTF': SRTFSchedulingAlgorithm(kernel, quantum),
-        #    'LRTF': LRTFSchedulingAlgorithm(kernel, quantum),
-        #    'RR':   RRSchedulingAlgorithm(kernel, quantum),
-        #    #'MLQ':  MLQSchedulingAlgorithm(kernel, quantum)
-        #}
-    # hay que hacer una lista de los espacios en cada agujero (De la memoria fisica), reemplazando el next_free_memory_addr     
-    # una idea es crear una clase hueco por ejemplo
+        # Then we keep track of the currently selected algorithm
+        self.__current_algorithm_name = memory_algorithm
+        self.__current_algorithm = self.__available_memory_algorithms[memory_algorithm]
+
+    @property
+    def current_algorithm_name(self):
+        """ Returns the name of the memory algorithm being used. """
+        return self.__current_algorithm_name
+
+    @property
+    def current_algorithm(self):
+        """ Returns the memory algorithm being used. """
+        return self.__current_algorithm
+
+    @property
+    def compactions(self):
+        """ Returns the number of compactions performed. """
+        return self.__compactions
 
+    @property
+    def compacted_cells(self):
+        """ Returns the number of memory cells moved by compactions. """
+        return self.__compacted_cells
 
-    # El load podria ser un funcion que se delegaria al algoritmo
-    # def load(self, data):
-    #     """
-    #     Load a given program data into memory. Return the location
-    #     where the first instruction was allocated.
-    #     Fails if there is not enough free contiguous memory.
-    #     """
-    #     if not self.__has_free_memory(len(data)):
-    #         raise RuntimeError("Not enough free memory.")
+    @property
+    def compaction_ticks(self):
+        """ Returns the ticks the cores were stalled by all the compactions performed. """
+        return self.__compaction_ticks
 
-    #     memory_location = self.__next_free_memory_addr
-    #     # esto queda casi que igualk, cambia lo de arriba
-    #     for i in range(0, len(data)):
-    #         HARDWARE.memory.write(memory_location + i, data[i])
-    #     self.__next_free_memory_addr += len(data)
-    #     return memory_location
-    
-    def load(self, data):
-        self.__current_algorithm.load(data)
+    @property
+    def shared_texts(self):
+        """ Returns the table of the program texts shared by the processes. """
+        return self.__shared_texts
+
+    def load(self, program):
+        """
+        Load a given program into memory. Return the location
+        where the first instruction was allocated, which is the one
+        of the text already loaded, if the program is running.
+        Fails if there is not enough free contiguous memory,
+        even after compacting it.
+        The program is copied in chunks, so it's never expanded as a whole,
+        but it takes a memory cell per instruction. When programs do not
+        fit, page them on demand, with the DemandPagedLoader.
+        """
+        memory_location = self.__shared_texts.share(program)
+        if (memory_location is not None):
+            return memory_location
+        if (self.__should_compact(program.size)):
+            self.compact()
+        memory_location = self.__current_algorithm.allocate(program.size)
+        memory = self.__kernel.hardware.memory
+        address = memory_location
+        for chunk in program.chunks():
+            memory.write_block(address, chunk)
+            address += len(chunk)
+        # An empty program takes no memory, so there is nothing to share
+        if (program.size > 0):
+            self.__shared_texts.add(program, memory_location)
+        return memory_location
 
-    # El unload igual, se delega al algoritmo
     def unload(self, pcb):
         """
         Remove a program that is loaded into memory from the memory.
         The PCB is received and used to know where the program is
-        stored in memory.
+        stored in memory. The text stays while other processes use it.
+        """
+        if (pcb.memory_size > 0 and not self.__shared_texts.release(pcb.memory_start)):
+            return
+        # Leave the cells EMPTY, the default value to fill with
+        self.__kernel.hardware.memory.fill(pcb.memory_start, pcb.memory_size)
+        self.__current_algorithm.free(pcb.memory_start, pcb.memory_size)
+
+    def compact(self):
+        """
+        Move every loaded program to the start of memory, one after the
+        other, so all the free memory becomes a single hole. The PCBs, and
+        the MMU of the cores running them, are updated to the new locations.
+        A shared text is moved once, for all of its processes.
+        The cores are stalled while the cells are moved.
         """
-        for i in range(pcb.memory_start, pcb.memory_end):
-            HARDWARE.memory.write(i, '')
+        algorithm = self.__current_algorithm
+        if (not algorithm.supports_compaction):
+            raise RuntimeError("The memory algorithm " + self.__current_algorithm_name + " does not support compaction.")
+        memory = self.__kernel.hardware.memory
+        scheduler = self.__kernel.scheduler
+        moved_cells = 0
+        next_free_memory_addr = 0
+        # From the old location of each text to the new one
+        new_locations = {}
+        # The largest first, so an empty program never takes the place of a text
+        for pcb in sorted(self.__kernel.process_table.all_pcbs(), key=lambda pcb: (pcb.memory_start, -pcb.memory_size)):
+            new_location = new_locations.get(pcb.memory_start)
+            if (new_location is None):
+                new_location = next_free_memory_addr
+                new_locations[pcb.memory_start] = new_location
+                if (pcb.memory_start != new_location):
+                    memory.move_block(pcb.memory_start, new_location, pcb.memory_size)
+                    moved_cells += pcb.memory_size
+                    if (pcb.memory_size > 0):
+                        self.__shared_texts.relocate(pcb.memory_start, new_location)
+                next_free_memory_addr += pcb.memory_size
+            if (pcb.memory_start != new_location):
+                pcb.memory_start = new_location
+                # A running process keeps running from its new location
+                core_id = scheduler.core_running(pcb.pid)
+                if (core_id is not None):
+                    self.__kernel.hardware.core(core_id).mmu.baseDir = new_location
+        # Clean what was left behind by the moved programs
+        memory.fill(next_free_memory_addr, memory.size - next_free_memory_addr)
+        algorithm.compacted(next_free_memory_addr)
+        self.__compactions += 1
+        self.__compacted_cells += moved_cells
+        compaction_ticks = -(-moved_cells // COMPACTION_CELLS_PER_TICK)
+        self.__kernel.hardware.stall(compaction_ticks)
+        self.__compaction_ticks += compaction_ticks
 
-    def __has_free_memory(self, size):
-        """ Answer if there is enough free contiguous memory to store some data. """
-        return self.__free_memory() >= size
+    def __should_compact(self, size):
+        """ Answer if memory should be compacted before loading a program of the given size. """
+        algorithm = self.__current_algorithm
+        if (self.__compaction_threshold is None or not algorithm.supports_compaction):
+            return False
+        if (algorithm.largest_hole < size):
+            # Compacting helps only if the program fits in the free memory
+            return algorithm.free_memory >= size
+        return algorithm.external_fragmentation > self.__compaction_threshold
 
-    def __free_memory(self):
-        """ Returns the amount of free contiguous memory. """
-        return HARDWARE.memory.size - self.__next_free_memory_addr
\ No newline at end of file
+    def __repr__(self):
+        algorithm = self.__current_algorithm
+        return Printer.tabulated([[
+            Printer.tabulated([
+                ["Free memory", algorithm.free_memory],
+                ["Largest hole", algorithm.largest_hole],
+                ["Ext. fragmentation", round(algorithm.external_fragmentation, 2)],
+                ["Int. fragmentation", algorithm.internal_fragmentation],
+                ["Compactions", self.__compactions],
+                ["Compaction ticks", self.__compaction_ticks],
+                ["Shared texts", self.__shared_texts.number_of_texts],
+                ["Shared loads", self.__shared_texts.shared_loads]
+            ])
+        ]], headers=["Memory"])
@@ -0,0 +1,68 @@
+class AbstractMemoryAlgorithm:
+    """
+    Models a strategy to choose where in physical memory each program is
+    loaded, keeping track of which memory is free. The loader asks it for
+    memory when loading a program, and gives it back when unloading it.
+    """
+
+    def __init__(self, memory_size):
+        self.__memory_size = memory_size
+
+    @property
+    def memory_size(self):
+        """ Returns the size of the memory being managed. """
+        return self.__memory_size
+
+    @property
+    def free_memory(self):
+        """ Returns the amount of free memory. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    @property
+    def largest_hole(self):
+        """ Returns the size of the largest block of free contiguous memory. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    @property
+    def external_fragmentation(self):
+        """
+        Returns the fraction of the free memory that is not in the largest
+        hole, from 0 (all free memory is contiguous) to almost 1 (free
+        memory is spread in many small holes).
+        """
+        if (self.free_memory == 0):
+            return 0
+        return 1 - self.largest_hole / self.free_memory
+
+    @property
+    def internal_fragmentation(self):
+        """
+        Returns the amount of memory that is reserved for the programs
+        but not used by them. Zero unless blocks are rounded up.
+        """
+        return 0
+
+    def allocate(self, size):
+        """
+        Reserve the given amount of contiguous memory, and
+        return the address where it starts.
+        Fails if there is not enough free contiguous memory.
+        """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    def free(self, start, size):
+        """ Release the given block of memory, so it can be used again. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    @property
+    def supports_compaction(self):
+        """ Answers if the programs in memory can be moved together, to join the free memory. """
+        return False
+
+    def compacted(self, used_size):
+        """
+        Update the free memory after a compaction, that is, after every
+        program was moved to the start of memory, one after the other,
+        taking the given number of cells.
+        """
+        raise RuntimeError("This memory algorithm does not support compaction.")
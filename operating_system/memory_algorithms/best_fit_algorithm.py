@@ -0,0 +1,7 @@
+from operating_system.memory_algorithms.hole_fit_algorithm import HoleFitAlgorithm
+
+class BestFitAlgorithm(HoleFitAlgorithm):
+    """ Uses the smallest hole where the program fits, leaving the smallest possible hole. """
+
+    def find_hole(self, size):
+        return self.hole_manager.best_fit(size)
@@ -0,0 +1,106 @@
+from operating_system.memory_algorithms.abstract_memory_algorithm import AbstractMemoryAlgorithm
+
+class BuddyAlgorithm(AbstractMemoryAlgorithm):
+    """
+    The binary buddy system. Memory is handed out in blocks whose size is
+    a power of two (2^order cells), aligned to their size. A program gets
+    the smallest block it fits in, so part of the block may be wasted
+    (internal fragmentation). To get a block, a larger free one is split
+    in halves, the buddies, as many times as needed. When a block is freed
+    and its buddy is free too, both are merged back into the larger block,
+    again as many times as possible. As there are only log(memory size)
+    orders, allocating and freeing take O(log memory size), always.
+    If the memory size is not a power of two, it starts as the largest
+    aligned blocks that fit, which are never merged past the memory end.
+    """
+
+    def __init__(self, memory_size):
+        super().__init__(memory_size)
+        self.__max_order = max(0, memory_size.bit_length() - 1)
+        # For each order, the start of its free blocks...
+        self.__free_blocks = [set() for _ in range(self.__max_order + 1)]
+        # ...and a bitmap, with a bit per block of that order, set if it's free
+        self.__free_bitmaps = [
+            bytearray(((memory_size >> order) + 8) // 8) for order in range(self.__max_order + 1)
+        ]
+        # From the start of each allocated block to its order and the size asked for
+        self.__allocated = {}
+        self.__free_memory = 0
+        self.__internal_fragmentation = 0
+        # Split the memory in the largest aligned blocks that fit
+        start = 0
+        for order in range(self.__max_order, -1, -1):
+            if (memory_size & (1 << order)):
+                self.__add_free_block(start, order)
+                start += 1 << order
+
+    @property
+    def free_memory(self):
+        return self.__free_memory
+
+    @property
+    def largest_hole(self):
+        for order in range(self.__max_order, -1, -1):
+            if (self.__free_blocks[order]):
+                return 1 << order
+        return 0
+
+    @property
+    def internal_fragmentation(self):
+        return self.__internal_fragmentation
+
+    def allocate(self, size):
+        order = max(0, size - 1).bit_length()
+        # Find the smallest free block where it fits
+        block_order = order
+        while (block_order <= self.__max_order and not self.__free_blocks[block_order]):
+            block_order += 1
+        if (block_order > self.__max_order):
+            raise RuntimeError("Not enough free contiguous memory.")
+        start = self.__free_blocks[block_order].pop()
+        self.__mark(start, block_order, False)
+        self.__free_memory -= 1 << block_order
+        # Split it in halves, keeping the first one, until it's of the needed size
+        while (block_order > order):
+            block_order -= 1
+            self.__add_free_block(start + (1 << block_order), block_order)
+        self.__allocated[start] = (order, size)
+        self.__internal_fragmentation += (1 << order) - size
+        return start
+
+    def free(self, start, size):
+        if (start not in self.__allocated):
+            raise RuntimeError("Cannot free {size} cells at {start}, it was not allocated".format(size=size, start=start))
+        order, allocated_size = self.__allocated.pop(start)
+        self.__internal_fragmentation -= (1 << order) - allocated_size
+        # Merge with the buddy while it's free
+        while (order < self.__max_order):
+            buddy = start ^ (1 << order)
+            if (not self.__is_free(buddy, order)):
+                break
+            self.__free_blocks[order].discard(buddy)
+            self.__mark(buddy, order, False)
+            self.__free_memory -= 1 << order
+            start = min(start, buddy)
+            order += 1
+        self.__add_free_block(start, order)
+
+    def __add_free_block(self, start, order):
+        """ Make the block of the given order, at the given start, free. """
+        self.__free_blocks[order].add(start)
+        self.__mark(start, order, True)
+        self.__free_memory += 1 << order
+
+    def __is_free(self, start, order):
+        """ Answer if the block of the given order, at the given start, is free. """
+        index = start >> order
+        bitmap = self.__free_bitmaps[order]
+        return (index >> 3) < len(bitmap) and bool(bitmap[index >> 3] & (1 << (index & 7)))
+
+    def __mark(self, start, order, free):
+        """ Set or clear the bit of the block of the given order, at the given start. """
+        index = start >> order
+        if (free):
+            self.__free_bitmaps[order][index >> 3] |= 1 << (index & 7)
+        else:
+            self.__free_bitmaps[order][index >> 3] &= ~(1 << (index & 7)) & 0xFF
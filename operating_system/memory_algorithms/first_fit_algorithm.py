@@ -1,12 +1,7 @@
+from operating_system.memory_algorithms.hole_fit_algorithm import HoleFitAlgorithm
 
+class FirstFitAlgorithm(HoleFitAlgorithm):
+    """ Uses the first hole, by address, where the program fits. """
 
-class FirstFitAlgorithm:
-    def __init__(self):
-        pass
-
-
-    def load(self, data):
-        pass
-
-
-
+    def find_hole(self, size):
+        return self.hole_manager.first_fit(size)
@@ -0,0 +1,49 @@
+from operating_system.hole_manager import HoleManager
+from operating_system.memory_algorithms.abstract_memory_algorithm import AbstractMemoryAlgorithm
+
+class HoleFitAlgorithm(AbstractMemoryAlgorithm):
+    """
+    The algorithms that keep the free memory as holes, and load each
+    program in the first cells of one of them. What is left of the
+    hole remains free. Subclasses only choose the hole to use.
+    """
+
+    def __init__(self, memory_size):
+        super().__init__(memory_size)
+        self.__hole_manager = HoleManager(memory_size)
+
+    @property
+    def hole_manager(self):
+        """ Returns the manager of the memory holes. """
+        return self.__hole_manager
+
+    @property
+    def free_memory(self):
+        return self.__hole_manager.free_memory
+
+    @property
+    def largest_hole(self):
+        return self.__hole_manager.largest_hole
+
+    def find_hole(self, size):
+        """ Returns the hole to use for a program of the given size, or None if none fits. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    def allocate(self, size):
+        hueco = self.find_hole(size)
+        if (hueco is None):
+            raise RuntimeError("Not enough free contiguous memory.")
+        return self.__hole_manager.take(hueco, size)
+
+    def free(self, start, size):
+        self.__hole_manager.free(start, size)
+
+    @property
+    def supports_compaction(self):
+        return True
+
+    def compacted(self, used_size):
+        # All the free memory is now a single hole, after the programs
+        self.__hole_manager = HoleManager(self.memory_size)
+        if (used_size > 0):
+            self.__hole_manager.take(self.__hole_manager.first_fit(used_size), used_size)
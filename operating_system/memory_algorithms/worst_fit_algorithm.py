@@ -0,0 +1,7 @@
+from operating_system.memory_algorithms.hole_fit_algorithm import HoleFitAlgorithm
+
+class WorstFitAlgorithm(HoleFitAlgorithm):
+    """ Uses the largest hole, leaving the largest possible hole for the programs to come. """
+
+    def find_hole(self, size):
+        return self.hole_manager.worst_fit(size)
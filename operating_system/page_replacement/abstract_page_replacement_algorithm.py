@@ -0,0 +1,31 @@
+class AbstractPageReplacementAlgorithm:
+    """
+    Models a strategy to choose the page to take out of memory, when a
+    page is needed and there are no free frames. The loader tells the
+    algorithm which pages are loaded, in which frames, and which ones
+    are unloaded, and asks it for a victim when memory is full.
+    """
+
+    def __init__(self, kernel):
+        self.__kernel = kernel
+
+    @property
+    def kernel(self):
+        """ Returns the OS kernel. """
+        return self.__kernel
+
+    def page_loaded(self, frame, pcb, page):
+        """ The given page of the process with the given PCB was loaded in the given frame. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    def page_unloaded(self, frame):
+        """ The page in the given frame was unloaded, as its process ended. """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
+
+    def choose_victim(self, pinned_frames):
+        """
+        Returns the frame whose page should be taken out of memory, and
+        forgets it. The pinned frames cannot be chosen. Returns None
+        if every frame is pinned.
+        """
+        raise RuntimeError("Should be implemented by the subclass, but it did not implement it.")
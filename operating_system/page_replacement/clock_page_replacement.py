@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+from operating_system.page_replacement.abstract_page_replacement_algorithm import AbstractPageReplacementAlgorithm
+
+class ClockPageReplacementAlgorithm(AbstractPageReplacementAlgorithm):
+    """
+    An approximation of taking out the page used the longest ago (LRU).
+    Frames are visited in a circle, as by the hand of a clock. A frame
+    whose page was accessed since the last visit (as told by the bit set
+    by the MMU) gets a second chance: the bit is cleared and the hand
+    moves on. The first frame whose page was not accessed is the victim.
+    """
+
+    def __init__(self, kernel):
+        super().__init__(kernel)
+        # The frames in use, in the order the hand visits them
+        self.__frames = OrderedDict()
+
+    def page_loaded(self, frame, pcb, page):
+        self.__frames[frame] = True
+        # It's about to be used, by the process that needed it
+        self.kernel.hardware.accessed_frames[frame] = 1
+
+    def page_unloaded(self, frame):
+        del self.__frames[frame]
+
+    def choose_victim(self, pinned_frames):
+        if (all(frame in pinned_frames for frame in self.__frames)):
+            return None
+        accessed_frames = self.kernel.hardware.accessed_frames
+        while True:
+            frame = next(iter(self.__frames))
+            if (frame in pinned_frames):
+                # The hand goes past it, it cannot be taken out yet
+                self.__frames.move_to_end(frame)
+                continue
+            if (not accessed_frames[frame]):
+                del self.__frames[frame]
+                return frame
+            # A second chance. The translations kept in the TLBs are
+            # forgotten, so the next access sets the bit again.
+            accessed_frames[frame] = 0
+            self.kernel.loader.invalidate_translations(frame)
+            self.__frames.move_to_end(frame)
@@ -0,0 +1,24 @@
+from collections import OrderedDict
+
+from operating_system.page_replacement.abstract_page_replacement_algorithm import AbstractPageReplacementAlgorithm
+
+class FIFOPageReplacementAlgorithm(AbstractPageReplacementAlgorithm):
+    """ Takes out the page that was loaded the longest ago. """
+
+    def __init__(self, kernel):
+        super().__init__(kernel)
+        # The frames in use, the one loaded the longest ago first
+        self.__frames = OrderedDict()
+
+    def page_loaded(self, frame, pcb, page):
+        self.__frames[frame] = True
+
+    def page_unloaded(self, frame):
+        del self.__frames[frame]
+
+    def choose_victim(self, pinned_frames):
+        for frame in self.__frames:
+            if (frame not in pinned_frames):
+                del self.__frames[frame]
+                return frame
+        return None
@@ -0,0 +1,40 @@
+from operating_system.page_replacement.abstract_page_replacement_algorithm import AbstractPageReplacementAlgorithm
+
+class OptimalPageReplacementAlgorithm(AbstractPageReplacementAlgorithm):
+    """
+    Takes out the page that will be needed the latest, which gives the
+    fewest page faults possible. It's only possible as programs run their
+    instructions one after the other: a page behind the PC of its process
+    is never needed again, and one ahead of it is needed as many
+    instructions later as it's ahead. Processes run interleaved, so the
+    distance in instructions only approximates the distance in time.
+    It's meant to compare the other algorithms against.
+    """
+
+    def __init__(self, kernel):
+        super().__init__(kernel)
+        # From each frame in use to the PCB and page in it
+        self.__pages = {}
+
+    def page_loaded(self, frame, pcb, page):
+        self.__pages[frame] = (pcb, page)
+
+    def page_unloaded(self, frame):
+        del self.__pages[frame]
+
+    def choose_victim(self, pinned_frames):
+        candidates = [frame for frame in self.__pages if frame not in pinned_frames]
+        if (not candidates):
+            return None
+        victim = max(candidates, key=lambda frame: self.__next_use(*self.__pages[frame]))
+        del self.__pages[victim]
+        return victim
+
+    def __next_use(self, pcb, page):
+        """ Returns how many instructions later the given page will be needed by its process. """
+        pc = pcb.current_pc
+        page_size = self.kernel.hardware.page_size
+        page_start = page * page_size
+        if (page_start + page_size <= pc):
+            return float("inf")
+        return max(0, page_start - pc)
@@ -0,0 +1,90 @@
+from utilities.printer import Printer
+
+from operating_system.frame_allocator import FrameAllocator
+from operating_system.shared_text_table import SharedTextTable
+
+class PagedLoader:
+    """
+    The loader used when memory is paged. A program is split in pages,
+    and each one is loaded in any free frame, so a program needs free
+    frames, but not contiguous memory. The frames of each page are kept
+    in the page table of the process.
+    A program loaded many times is in memory only once: the page table
+    of each process running it maps the same frames, which are freed
+    with the last one.
+    """
+
+    def __init__(self, kernel):
+        self.__kernel = kernel
+        self.__page_size = kernel.hardware.page_size
+        self.__frame_allocator = FrameAllocator(kernel.hardware.memory.size // self.__page_size)
+        # The texts of the programs loaded, by their frames, shared by their processes
+        self.__shared_texts = SharedTextTable()
+
+    @property
+    def current_algorithm_name(self):
+        """ Returns the name of the memory algorithm being used. """
+        return "Paging"
+
+    @property
+    def frame_allocator(self):
+        """ Returns the allocator of the memory frames. """
+        return self.__frame_allocator
+
+    @property
+    def shared_texts(self):
+        """ Returns the table of the program texts shared by the processes. """
+        return self.__shared_texts
+
+    def load(self, program):
+        """
+        Load a given program into memory, page by page.
+        Return the page table, that is, the frame of each page, which
+        are the ones of the text already loaded, if the program is running.
+        Fails if there are not enough free frames.
+        """
+        frames = self.__shared_texts.share(program)
+        if (frames is not None):
+            # Each process has its own page table, to the same frames
+            return list(frames)
+        number_of_pages = -(-program.size // self.__page_size)
+        if (number_of_pages > self.__frame_allocator.free_frames):
+            raise RuntimeError("Not enough free memory.")
+        memory = self.__kernel.hardware.memory
+        page_table = []
+        # A chunk per page, so only a page is expanded at a time
+        for page in program.chunks(self.__page_size):
+            frame = self.__frame_allocator.allocate()
+            memory.write_block(frame * self.__page_size, page)
+            page_table.append(frame)
+        if (page_table):
+            self.__shared_texts.add(program, tuple(page_table))
+        return page_table
+
+    def unload(self, pcb):
+        """
+        Remove a program that is loaded into memory from the memory,
+        giving back the frames of its pages, unless other processes
+        still use them.
+        """
+        if (pcb.page_table and not self.__shared_texts.release(tuple(pcb.page_table))):
+            return
+        memory = self.__kernel.hardware.memory
+        for frame in pcb.page_table:
+            # Leave the cells EMPTY, the default value to fill with
+            memory.fill(frame * self.__page_size, self.__page_size)
+            self.__frame_allocator.free(frame)
+
+    def __repr__(self):
+        cores = self.__kernel.hardware.cores
+        return Printer.tabulated([[
+            Printer.tabulated([
+                ["Page size", self.__page_size],
+                ["Free frames", self.__frame_allocator.free_frames],
+                ["Used frames", self.__frame_allocator.number_of_frames - self.__frame_allocator.free_frames],
+                ["Shared texts", self.__shared_texts.number_of_texts],
+                ["Shared loads", self.__shared_texts.shared_loads],
+                ["TLB hits", sum(core.mmu.tlb_hits for core in cores)],
+                ["TLB misses", sum(core.mmu.tlb_misses for core in cores)]
+            ])
+        ]], headers=["Memory"])
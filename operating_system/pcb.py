@@ -1,7 +1,5 @@
 from utilities.printer import Printer
-
-from hardware.hardware import HARDWARE
-from hardware.asm import ASM
+from utilities.compiler import CpuCounts
 
 NEW = "NEW"
 READY = "READY"
@@ -12,17 +10,39 @@ TERMINATED = "TERMINATED"
 class PCB:
     """Models a PCB"""
 
-    def __init__(self, pid, memory_start, memory_size, priority = 3, category = 'batch'):
+    def __init__(self, pid, memory_start, memory_size, memory, priority = 3, category = 'batch',
+                 page_table = None, page_size = None, cpu_counts = None, name = None):
+        """
+        The memory is the one of the hardware the process runs on,
+        where the program of the process has already been loaded.
+        When memory is paged, the program is in the frames of the page
+        table, and the memory start is not used. When paging on demand,
+        the memory is the swap drive, where the program is contiguous,
+        so no page size is given, and the page table starts empty.
+        The CPU counts of the program tell how many CPU instructions come
+        before each position, so the burst and remaining times are known
+        without reading memory. If they are not given, memory is read
+        once to count them. A query is not the O(1) of a prefix count per
+        instruction, but O(log runs): such an array takes 4 bytes per
+        instruction, and would expand again the runs of long programs.
+        The remaining time is counted from the PC of the core running the
+        process, if any, so it's up to date for the running process too.
+        The name is only used to show the process.
+        """
         self.__pid = pid
+        self.__name = name
+        self.__memory = memory
         self.__state = NEW
         self.__memory_start = memory_start
         self.__memory_size = memory_size
+        self.__page_table = page_table
+        self.__page_size = page_size
         self.__pc = 0
         #self.__pc = memory_start
-        # For SJF, LJF, not used otherwise
-        self.__burst_time = self.__calculate_burst_time(memory_start, memory_size)
-        # For SRTF, LRTF, not used otherwise
-        self.__remaining_time = self.__burst_time
+        # The CPU core running the process, set by the dispatcher
+        self.__core = None
+        # For SJF, LJF, SRTF and LRTF, not used otherwise
+        self.__cpu_counts = self.__count_cpu_instructions() if cpu_counts is None else cpu_counts
         # For FPPS, not used otherwise
         self.__priority = priority
         # For MLQ, not used otherwise
@@ -33,6 +53,11 @@ class PCB:
         """ Returns the PCB's PID. """
         return self.__pid
 
+    @property
+    def name(self):
+        """ Returns the name of the process, or None if it has none. """
+        return self.__name
+
     @property
     def state(self):
         """ Returns the PCB's state. """
@@ -50,10 +75,27 @@ class PCB:
         associated program for this PCB is store at.
         """
         return self.__memory_start
-    
+
+    @memory_start.setter
+    def memory_start(self, value):
+        """ Assign the initial memory position, when the program is moved in memory. """
+        self.__memory_start = value
+
+    @property
     def memory_size(self):
+        """
+        Returns the number of memory positions the
+        associated program for this PCB takes.
+        """
+        return self.__memory_size
 
-        return self.memory_size
+    @property
+    def page_table(self):
+        """
+        Returns the frame of each page of the associated program
+        for this PCB, or None if memory is not paged.
+        """
+        return self.__page_table
 
     @property
     def memory_end(self):
@@ -73,10 +115,28 @@ class PCB:
         """ Assign the status of the PC registry for this PCB. """
         self.__pc = value
 
+    @property
+    def core(self):
+        """ Returns the CPU core running this process, or None if it's not running. """
+        return self.__core
+
+    @core.setter
+    def core(self, value):
+        """ Assign the CPU core running this process. """
+        self.__core = value
+
+    @property
+    def current_pc(self):
+        """
+        Returns the PC of the process now. While running, the PCB only has
+        the PC saved at the last context switch, so it's the core's one.
+        """
+        return self.__pc if self.__core is None else self.__core.pc
+
     @property
     def burst_time(self):
         """ Returns the burst time of this PCB. """
-        return self.__burst_time
+        return self.__cpu_counts[self.__memory_size]
 
     @property
     def priority(self):
@@ -90,25 +150,31 @@ class PCB:
 
     @property
     def remaining_time(self):
-        """ Returns the remaining time of this PCB. """
-        return self.__remaining_time
-
-    def recalculate_remaining_time(self):
-        """ Recalculate and store the remaining time of this PCB. """
-        self.__remaining_time = self.__calculate_burst_time(self.__pc, self.__memory_size)
-
-    def __calculate_burst_time(self, from_addr, to_addr):
-        """ Calculare the burst-time of the instruction from one memory position to the next"""
-        cpu_instructions = [
-            location
-            for location in range(from_addr, to_addr)
-            if ASM.is_CPU(HARDWARE.memory.read(location))
-        ]
-        return len(cpu_instructions)
+        """ Returns the remaining time of this PCB, that is, the CPU instructions from its current PC on. """
+        return self.__cpu_counts[self.__memory_size] - self.__cpu_counts[min(self.current_pc, self.__memory_size)]
+
+    def __count_cpu_instructions(self):
+        """ Returns how many CPU instructions of the program come before each position, reading them from memory. """
+        runs = []
+        for location in range(0, self.__memory_size):
+            instruction = self.__memory.read(self.__physical_address(location))
+            if (runs and runs[-1][0] == instruction):
+                runs[-1][1] += 1
+            else:
+                runs.append([instruction, 1])
+        return CpuCounts(runs)
+
+    def __physical_address(self, pc):
+        """ Returns the physical address of an instruction of the program. """
+        if (self.__page_size is None):
+            return self.__memory_start + pc
+        page, offset = divmod(pc, self.__page_size)
+        return self.__page_table[page] * self.__page_size + offset
 
     def __repr__(self):
         return Printer.tabulated([
             ["PID", self.__pid],
+            ["Name", self.__name],
             ["State", self.__state],
             ["M.Start", self.__memory_start],
             ["M.Size", self.__memory_size],
@@ -51,7 +51,7 @@ class ProcessTable():
 
     def all_pcbs(self):
         """ Return all the PCBs. """
-        return self.__table.items()
+        return self.__table.values()
 
     def __repr__(self):
         # We join the processes in a list of elements each, so
@@ -38,7 +38,7 @@ class Scheduler():
     what, and changing them around in a coherent state at different times. It
     does this with support of the Dispatcher.
     """
-    def __init__(self, kernel, scheduling_algorithm, quantum):
+    def __init__(self, kernel, scheduling_algorithm, quantum, number_of_cores=1):
         self.__kernel = kernel
         # We create the list of possible algorithms to use.
         self.__available_scheduling_algorithms = {
@@ -55,10 +55,10 @@ class Scheduler():
         self.__current_algorithm_name = scheduling_algorithm
         self.__current_algorithm = self.__available_scheduling_algorithms[scheduling_algorithm]
         # Also, still we are going to keep track of the current process being
-        # running by the CPU. The general scheduling is in charge of this,
+        # running by each CPU core. The general scheduling is in charge of this,
         # while the algorithms define the next process to run.
-        # Of course, we start with no process running.
-        self.__currently_running_pid = None
+        # Of course, we start with no process running on any core.
+        self.__running_pids = [None] * number_of_cores
 
     @property
     def current_algorithm_name(self):
@@ -80,8 +80,33 @@ class Scheduler():
 
     @property
     def currently_running_pid(self):
-        """ Returns the running process ID. """
-        return self.__currently_running_pid
+        """ Returns the running process ID, on the first core if there are many. """
+        return self.__running_pids[0]
+
+    @property
+    def running_pids(self):
+        """ Returns the running process ID of each core, None for an idle core. """
+        return tuple(self.__running_pids)
+
+    @property
+    def number_of_cores(self):
+        """ Returns the number of CPU cores the scheduler assigns processes to. """
+        return len(self.__running_pids)
+
+    def running_pid_on(self, core_id):
+        """ Returns the process ID running on the given core, or None if it's idle. """
+        return self.__running_pids[core_id]
+
+    def core_running(self, pid):
+        """ Returns the id of the core the given process is running on, or None if not running. """
+        if pid in self.__running_pids:
+            return self.__running_pids.index(pid)
+        return None
+
+    @property
+    def idle_core(self):
+        """ Returns the id of the first idle core, or None if all of them are busy. """
+        return self.core_running(None)
 
     @property
     def next_process_id(self):
@@ -110,10 +135,9 @@ class Scheduler():
         # If it's a new process, or if it comes from waiting there is not much to do in a general term.
         if pcb.state is NEW or pcb.state is WAITING:
             pass
-        # If it is on the running state, we need to unload it from the CPU
+        # If it is on the running state, we need to unload it from its CPU core
         if pcb.state is RUNNING:
-            self.__kernel.dispatcher.save(pcb)
-            self.__currently_running_pid = None
+            self.__unload_from_core(pid, pcb)
         # Now that we have handled the basics, let's delegate to the
         # algorithm how to handle the passage of this process to ready
         # We do this before changing the state, so the algorithm can
@@ -124,8 +148,11 @@ class Scheduler():
 
 
 
-    def move_to_running(self, pid):
-        """ Move a process with the given pid to the running state. """
+    def move_to_running(self, pid, core_id=None):
+        """
+        Move a process with the given pid to the running state, on the given
+        CPU core. If no core is given, the first idle one is used.
+        """
         # Get the associated PCB
         pcb = self.__kernel.process_table.get_pcb_by_pid(pid)
         # To become running, the process must be in the ready state
@@ -134,14 +161,19 @@ class Scheduler():
         # To become running, it must be the next process
         if pid is not self.next_process_id:
             raise RuntimeError("IllegalState: No process other than the next can be moved to running")
-        # Set the process as the currently running one
-        self.__currently_running_pid = pid
+        # To become running, there must be an idle core for it
+        if core_id is None:
+            core_id = self.idle_core
+        if core_id is None or self.__running_pids[core_id] is not None:
+            raise RuntimeError("IllegalState: A process cannot be moved to RUNNING on a busy core")
+        # Set the process as the currently running one on the core
+        self.__running_pids[core_id] = pid
         # Change the PCB state to running
         pcb.state = RUNNING
         # Now let's delegate to the algorithm on how to move this process to running
         self.__current_algorithm.move_to_running(pid, pcb)
-        # And load the PCB to the CPU
-        self.__kernel.dispatcher.load(pcb)
+        # And load the PCB to the CPU core
+        self.__kernel.dispatcher.load(pcb, core_id)
 
     def move_to_waiting(self, pid):
         """ Move a process with the given pid to the waiting state. """
@@ -150,11 +182,9 @@ class Scheduler():
         # To become waiting, the process must be in the running state
         if pcb.state is not RUNNING:
             raise RuntimeError("IllegalState: A non RUNNING process cannot be moved to WAITING")
-        # Save the CPU to the PCB
-        self.__kernel.dispatcher.save(pcb)
-        # Now, there is no running process (Another process should be moved
-        # to running)
-        self.__currently_running_pid = None
+        # Save the CPU core to the PCB. Now, there is no running process
+        # on the core (Another process should be moved to running)
+        self.__unload_from_core(pid, pcb)
         # And of course, update the PCB state
         pcb.state = WAITING
         # Usually there is no much to do here, but some algorithms may require
@@ -169,20 +199,24 @@ class Scheduler():
         # To become terminated, the process must be in the running state
         if not pcb.state == RUNNING:
             raise RuntimeError("IllegalState: A non RUNNING process cannot be moved to TERMINATED")
-        # Save the CPU to the PCB
-        self.__kernel.dispatcher.save(pcb)
-        # Now, there is no running process (Another process should be moved
-        # to running)
-        self.__currently_running_pid = None
+        # Save the CPU core to the PCB. Now, there is no running process
+        # on the core (Another process should be moved to running)
+        self.__unload_from_core(pid, pcb)
         # And of course, update the PCB state
         pcb.state = TERMINATED
 
+    def __unload_from_core(self, pid, pcb):
+        """ Save the state of the core running the given process to its PCB, leaving the core idle. """
+        core_id = self.core_running(pid)
+        self.__kernel.dispatcher.save(pcb, core_id)
+        self.__running_pids[core_id] = None
+
     ############### END BASIC PROCESS STATE CHANGE ########################
 
     def __repr__(self):
         return Printer.tabulated([[
             Printer.tabulated([
-                ["Currently running", self.__currently_running_pid],
+                ["Currently running", self.__running_pids[0] if len(self.__running_pids) == 1 else str(self.__running_pids)],
                 ["Ready queue", str(self.__current_algorithm)]
             ])]], headers=["Scheduler"]
         )
\ No newline at end of file
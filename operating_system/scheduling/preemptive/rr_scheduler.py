@@ -16,11 +16,11 @@ class RRSchedulingAlgorithm(PreemptiveSchedulerAlgorithm):
         self.__ready_queue = Queue()
         self.__currently_running = None
         self.__remaining_ticks = 0
-        HARDWARE.clock.add_subscriber(self)
+        kernel.hardware.clock.add_subscriber(self)
 
 
     def tick(self, tick_num):
-        if(self.__remaining_ticks < self.quantum()):
+        if(self.__remaining_ticks < self.quantum):
             self.__remaining_ticks += 1
 
         else:
@@ -28,6 +28,25 @@ class RRSchedulingAlgorithm(PreemptiveSchedulerAlgorithm):
             IRQ.SWAP()
 
 
+    def quiet_ticks(self):
+        """
+        Answer how many ticks are left before the quantum expires. Every
+        algorithm is subscribed to the clock, but the quantum only matters
+        for the one the scheduler is using.
+        """
+        if (self.kernel.scheduler.current_algorithm is not self):
+            return float("inf")
+        return self.quantum - self.__remaining_ticks
+
+
+    def skip_ticks(self, ticks, tick_num):
+        """
+        Consume the given ticks of the current quantum. As on each tick,
+        the count goes back to 0 after reaching the quantum.
+        """
+        self.__remaining_ticks = (self.__remaining_ticks + ticks) % (self.quantum + 1)
+
+
     @property
     def next_process_id(self):
         if self.__ready_queue.is_empty :
@@ -0,0 +1,70 @@
+class SharedTextTable:
+    """
+    Keeps track of the program texts loaded in memory, so the processes
+    running the same program share a single copy of its instructions.
+    Programs are never written while running, so the shared text is
+    read-only, and no process ever needs a private copy of it.
+    Each text is known by its program, and by where it was loaded (the
+    location), and counts the processes using it. When the last one is
+    killed, the text is forgotten, and its memory can be reclaimed.
+    """
+
+    def __init__(self):
+        # From each program to the location of its text...
+        self.__locations = {}
+        # ...and from each location to its program and number of users
+        self.__texts = {}
+        # How many loads reused a text, instead of loading it again
+        self.__shared_loads = 0
+
+    @property
+    def number_of_texts(self):
+        """ Returns the number of texts loaded. """
+        return len(self.__texts)
+
+    @property
+    def number_of_users(self):
+        """ Returns the number of processes using the texts loaded. """
+        return sum(users for _, users in self.__texts.values())
+
+    @property
+    def shared_loads(self):
+        """ Returns how many loads reused a text already in memory. """
+        return self.__shared_loads
+
+    def share(self, program):
+        """
+        Returns the location of the text of the given program, adding a
+        user to it, or None if it's not loaded.
+        """
+        location = self.__locations.get(program)
+        if (location is None):
+            return None
+        text = self.__texts[location]
+        text[1] += 1
+        self.__shared_loads += 1
+        return location
+
+    def add(self, program, location):
+        """ Keep the text of the given program, loaded at the given location, with a single user. """
+        self.__locations[program] = location
+        self.__texts[location] = [program, 1]
+
+    def release(self, location):
+        """
+        Remove a user of the text at the given location. Answers if it was
+        the last one, so the text is forgotten and its memory can be freed.
+        """
+        text = self.__texts[location]
+        text[1] -= 1
+        if (text[1] > 0):
+            return False
+        del self.__texts[location]
+        del self.__locations[text[0]]
+        return True
+
+    def relocate(self, location, new_location):
+        """ The text at the given location was moved to the new one. """
+        text = self.__texts.pop(location)
+        self.__texts[new_location] = text
+        self.__locations[text[0]] = new_location
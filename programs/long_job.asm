@@ -0,0 +1,11 @@
+# A long running job, written with the run-length syntax:
+# an instruction followed by how many times it's repeated,
+# and REPEAT n { ... } to repeat a whole block.
+CPU 20
+REPEAT 3 {
+    IO
+    CPU 5
+}
+IO 2
+CPU 10
+EXIT
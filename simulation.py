@@ -0,0 +1,99 @@
+from history import History
+
+from hardware.hardware import Hardware
+from hardware.paged_mmu import DEFAULT_TLB_SIZE
+
+from operating_system.kernel import Kernel
+
+from utilities.workload_generator import WorkloadFeeder
+
+class Simulation:
+    """
+    A full simulated machine: the hardware, the OS running on it, and
+    the history of its execution. Nothing is shared between simulations,
+    so many of them can be built and run in the same interpreter.
+    """
+
+    def __init__(self, memory_size = 20, clock_speed = 1, device_timings = [], number_of_cores = 1,
+                 scheduling_strategy = 'FCFS', quantum = 0, record_history = True,
+                 seed = None, io_selection = 'uniform', io_weights = None, predecode = False,
+                 memory_algorithm = 'FirstFit', compaction_threshold = 1, page_size = None, tlb_size = DEFAULT_TLB_SIZE,
+                 swap_size = 0, swap_path = None, page_replacement = 'FIFO', mapped_memory = False, memory_path = None):
+        # First the hardware, as everything else runs on it
+        self.__hardware = Hardware()
+        self.__hardware.setup(
+            memory_size=memory_size,
+            clock_speed=clock_speed,
+            device_timings=device_timings,
+            number_of_cores=number_of_cores,
+            seed=seed,
+            io_selection=io_selection,
+            io_weights=io_weights,
+            predecode=predecode,
+            page_size=page_size,
+            tlb_size=tlb_size,
+            swap_size=swap_size,
+            swap_path=swap_path,
+            mapped_memory=mapped_memory,
+            memory_path=memory_path
+        )
+        # Then the OS, that receives the hardware it runs on
+        self.__kernel = Kernel(self.__hardware, scheduling_strategy=scheduling_strategy, quantum=quantum,
+                               memory_algorithm=memory_algorithm, compaction_threshold=compaction_threshold,
+                               page_replacement=page_replacement)
+        # The history helps us in visualizing how the execution happened,
+        # it's optional, as it's not part of the hardware nor the os
+        self.__history = History(self.__kernel) if record_history else None
+        # The feeders of the workloads being loaded
+        self.__feeders = []
+
+    @property
+    def hardware(self):
+        """ Returns the simulated hardware. """
+        return self.__hardware
+
+    @property
+    def kernel(self):
+        """ Returns the kernel of the OS running on the hardware. """
+        return self.__kernel
+
+    @property
+    def history(self):
+        """ Returns the history of the execution, or None if it's not recorded. """
+        return self.__history
+
+    @property
+    def clock(self):
+        """ Returns the hardware's clock. """
+        return self.__hardware.clock
+
+    def load_program(self, program, name = None):
+        """ Load a program in the OS, creating a new process, named as the program unless another name is given. """
+        self.__kernel.load_program(program, name)
+
+    def feed(self, workload):
+        """
+        Load the programs of a workload, that is, (arrival, program) pairs,
+        as they arrive, counting the arrivals from now. Returns the feeder.
+        """
+        feeder = WorkloadFeeder(self.__kernel, workload)
+        self.__feeders.append(feeder)
+        feeder.start()
+        return feeder
+
+    def run(self, ticks):
+        """ Run the given number of ticks. """
+        self.__hardware.clock.run(ticks)
+
+    def run_until_all_terminated(self, max_ticks):
+        """
+        Run until all the loaded processes have TERMINATED, and every fed
+        workload has been loaded, but never more than max_ticks ticks.
+        Answers if all processes have terminated.
+        """
+        return self.__hardware.clock.run_until(self.__all_terminated, max_ticks)
+
+    def __all_terminated(self):
+        """ Answer if every program has been loaded, and all processes have terminated. """
+        return (self.__kernel.all_processes_terminated
+                and all(feeder.is_exhausted for feeder in self.__feeders))
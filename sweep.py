@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Parameter sweeps: run many independent simulations, one for each
+combination of scheduling algorithm, quantum and workload, in parallel,
+and aggregate their metrics in a single CSV or JSON report.
+
+Run from the repository root, for example:
+    python sweep.py --schedulers FCFS RR --quanta 1 2 4 --csv report.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from simulation import Simulation
+
+from utilities.compiler import Compiler
+
+"""
+Built-in workloads. Each one is a list of (arrival, program name) pairs,
+where the arrival is the number of ticks elapsed before the program is
+loaded, and the program is the name of a file in the programs folder.
+"""
+WORKLOADS = {
+    'cpu_mix': [(0, 'cpu_long'), (4, 'cpu_short'), (5, 'cpu_medium'), (9, 'cpu_short')],
+    'io_mix': [(0, 'io_short'), (0, 'cpu_io_short'), (2, 'program3'), (3, 'program2'), (6, 'io_short')],
+    'mixed': [(0, 'cpu_long'), (1, 'io_short'), (2, 'cpu_medium'), (3, 'program2'), (5, 'program3'), (8, 'cpu_short')],
+}
+
+"""The columns of the report, in order."""
+REPORT_COLUMNS = [
+    'scheduler', 'quantum', 'workload', 'cores', 'seed', 'completed',
+    'ticks', 'processes', 'finished', 'throughput', 'cpu_utilization',
+    'avg_turnaround', 'avg_waiting', 'error'
+]
+
+class SweepRun:
+    """ The parameters of a single simulation in a sweep. """
+
+    def __init__(self, scheduler, quantum, workload_name, workload, memory_size, device_timings,
+                 cores, seed, max_ticks, programs_folder):
+        self.scheduler = scheduler
+        self.quantum = quantum
+        self.workload_name = workload_name
+        self.workload = workload
+        self.memory_size = memory_size
+        self.device_timings = device_timings
+        self.cores = cores
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.programs_folder = programs_folder
+
+def run_simulation(run):
+    """
+    Run a single simulation, and return its metrics as a dictionary.
+    This is what each worker process executes, so only the compact
+    metrics travel back, never the history itself. If the simulation
+    fails, the error is reported in the metrics instead of raised.
+    """
+    metrics = {
+        'scheduler': run.scheduler,
+        'quantum': run.quantum,
+        'workload': run.workload_name,
+        'cores': run.cores,
+        'seed': run.seed,
+        'completed': False,
+        'error': None
+    }
+    try:
+        simulation = Simulation(
+            seed=run.seed,
+            memory_size=run.memory_size,
+            device_timings=run.device_timings,
+            number_of_cores=run.cores,
+            scheduling_strategy=run.scheduler,
+            quantum=run.quantum
+        )
+        simulation.clock.overclock()
+        simulation.clock.fast_forward()
+        # Each program is loaded right after the number of ticks of its arrival
+        for arrival, program_name in run.workload:
+            program = Compiler.compile_file(program_name, run.programs_folder + '/' + program_name + '.asm')
+            simulation.clock.schedule(arrival + 1, lambda program=program: simulation.load_program(program))
+        # Make sure every program has been loaded before checking for termination
+        last_arrival = max([arrival for arrival, _ in run.workload], default=0)
+        simulation.run(last_arrival + 1)
+        metrics['completed'] = simulation.run_until_all_terminated(run.max_ticks - last_arrival - 1)
+        metrics.update(simulation.history.summary())
+    except Exception as e:
+        metrics['error'] = "{name}: {message}".format(name=e.__class__.__name__, message=str(e))
+    return metrics
+
+def sweep(schedulers, quanta, workloads, memory_size = 100, device_timings = [1, 2], cores = 1,
+          seeds = [0], max_ticks = 10000, programs_folder = './programs', workers = None):
+    """
+    Run a simulation for each combination of scheduler, quantum, workload
+    (a dictionary from name to workload) and seed, spread over a pool of
+    worker processes. Return the list of metrics, in the order of the runs.
+    """
+    runs = [
+        SweepRun(scheduler, quantum, name, workloads[name], memory_size, device_timings,
+                 cores, seed, max_ticks, programs_folder)
+        for scheduler, quantum, name, seed in product(schedulers, quanta, workloads, seeds)
+    ]
+    workers = os.cpu_count() if workers is None else workers
+    if workers == 1:
+        return [run_simulation(run) for run in runs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Send the runs in chunks, as each simulation is quite short
+        chunksize = max(1, len(runs) // (4 * workers))
+        return list(executor.map(run_simulation, runs, chunksize=chunksize))
+
+def write_csv(results, path):
+    """ Write the metrics of a sweep to a CSV file. """
+    with open(path, 'w', newline='') as file_handle:
+        writer = csv.DictWriter(file_handle, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+
+def write_json(results, path):
+    """ Write the metrics of a sweep to a JSON file. """
+    with open(path, 'w') as file_handle:
+        json.dump(results, file_handle, indent=2)
+
+def main(arguments):
+    parser = argparse.ArgumentParser(description="Run a parameter sweep over scheduling algorithms, quanta and workloads.")
+    parser.add_argument('--schedulers', nargs='+', default=['FCFS'])
+    parser.add_argument('--quanta', nargs='+', type=int, default=[0])
+    parser.add_argument('--workloads', nargs='+', default=list(WORKLOADS.keys()),
+                        help="Names of built-in workloads: " + ", ".join(WORKLOADS.keys()))
+    parser.add_argument('--workloads-file', help="A JSON file with a dictionary of additional workloads")
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--memory-size', type=int, default=100)
+    parser.add_argument('--device-timings', nargs='+', type=int, default=[1, 2])
+    parser.add_argument('--cores', type=int, default=1)
+    parser.add_argument('--max-ticks', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None, help="Defaults to the number of CPUs")
+    parser.add_argument('--csv', help="Write the report to this CSV file")
+    parser.add_argument('--json', help="Write the report to this JSON file")
+    args = parser.parse_args(arguments)
+
+    available = dict(WORKLOADS)
+    if args.workloads_file is not None:
+        with open(args.workloads_file) as file_handle:
+            available.update(json.load(file_handle))
+    workloads = {name: available[name] for name in args.workloads}
+
+    results = sweep(args.schedulers, args.quanta, workloads,
+                    memory_size=args.memory_size, device_timings=args.device_timings,
+                    cores=args.cores, seeds=args.seeds, max_ticks=args.max_ticks,
+                    workers=args.workers)
+
+    if args.csv is not None:
+        write_csv(results, args.csv)
+    if args.json is not None:
+        write_json(results, args.json)
+    if args.csv is None and args.json is None:
+        writer = csv.DictWriter(sys.stdout, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,49 +1,409 @@
-from hardware.asm import ASM
+from array import array
+from bisect import bisect_right
+
+from hardware.asm import ASM, OPCODE_CPU
+
+"""Keywords and symbols of the repeat syntax."""
+KEYWORD_REPEAT = "REPEAT"
+BLOCK_START = "{"
+BLOCK_END = "}"
+
+# How many instructions are expanded at a time when copying a program
+CHUNK_SIZE = 64 * 1024
 
 class Compiler:
-    """An utility class to create programs from an ASM code"""
+    """
+    An utility class to create programs from an ASM code.
+    Besides one instruction per line, the code may use:
+        - CPU 1000, IO 3: An instruction followed by the number of times
+          it's repeated in a row.
+        - REPEAT n { ... }: The instructions in the block, repeated n times.
+          Blocks may be nested, and span many lines.
+    Programs are compiled to runs of the same instruction, and REPEAT blocks
+    to repeats of their body, so compiling a long program never expands it
+    to one element per instruction. Loading it copies it to memory in
+    chunks, so it's never expanded as a whole either, but memory has a cell
+    for each instruction: a program with 'CPU 1000000' needs a million free
+    cells to be loaded. To run programs larger than memory, page them on
+    demand (with a page_size and a swap_size), so only the pages in use
+    take frames.
+    """
     @classmethod
     def compile(self, name, instructions):
         """Compile code and return a new program"""
-        expanded = []
+        tokens = []
         for i in instructions:
             if isinstance(i, list):
                 ## is a list of instructions
-                expanded.extend(i)
+                tokens.extend(i)
+            elif isinstance(i, str):
+                ## a line of code, split in words, braces are words by themselves
+                spaced = i.replace(BLOCK_START, " " + BLOCK_START + " ").replace(BLOCK_END, " " + BLOCK_END + " ")
+                tokens.extend(spaced.split())
             else:
-                ## a single instr (a String)
-                expanded.append(i)
+                ## a single instr (an Opcode)
+                tokens.append(i)
+
+        nodes, position = self.__parse_block(tokens, 0)
+        if position < len(tokens):
+            raise SyntaxError("Unexpected " + str(tokens[position]) + " with no block to close")
 
         ## Validate that there are no EXIT instructions, as
-        ## EXIT should be the last instruction only.
-        expanded = [i for i in expanded if not ASM.is_EXIT(i)]
+        ## EXIT should be the last instruction only, and that
+        ## all are valid instructions, or fail
+        nodes = self.__checked(nodes)
 
         ## now add EXIT as the last instruction, if it was
         ## added by the user, we removed it in the previous step
-        expanded.append(ASM.EXIT())
+        nodes.append((ASM.EXIT(), 1))
 
-        # Verify that all are valid instructions, or fail
-        for e in expanded:
-            if not ASM.is_valid(e):
-                raise SyntaxError("Invalid instruction: " + e)
         # Create a program and return it
-        return Program(name, expanded)
+        return Program(name, self.__merged(nodes))
+
+    @classmethod
+    def __parse_block(self, tokens, position):
+        """
+        Parse the instructions from the given position up to the end of the
+        current block (or of the tokens). Return the nodes of the block, that
+        is, runs of instructions, as (instruction, times) pairs, and repeats
+        of the nested blocks, and the position where parsing stopped.
+        """
+        nodes = []
+        while position < len(tokens):
+            token = tokens[position]
+            if token == BLOCK_END:
+                return nodes, position
+            if token == KEYWORD_REPEAT:
+                times = self.__parse_times(tokens, position + 1, KEYWORD_REPEAT)
+                if position + 2 >= len(tokens) or tokens[position + 2] != BLOCK_START:
+                    raise SyntaxError("Expected " + BLOCK_START + " after " + KEYWORD_REPEAT + " " + str(times))
+                body, position = self.__parse_block(tokens, position + 3)
+                if position >= len(tokens):
+                    raise SyntaxError("Missing " + BLOCK_END + " to close a " + KEYWORD_REPEAT + " block")
+                nodes.extend(self.__repeated(self.__merged(body), times))
+                position += 1
+                continue
+            instruction = ASM.encode(token) if isinstance(token, str) else token
+            times = 1
+            if position + 1 < len(tokens) and isinstance(tokens[position + 1], str) and tokens[position + 1].isdigit():
+                times = self.__parse_times(tokens, position + 1, token)
+                position += 1
+            nodes.append((instruction, times))
+            position += 1
+        return nodes, position
+
+    @classmethod
+    def __parse_times(self, tokens, position, after):
+        """ Parse the number of times something is repeated. """
+        if position >= len(tokens) or not isinstance(tokens[position], str) or not tokens[position].isdigit():
+            raise SyntaxError("Expected a number of times after " + str(after))
+        return int(tokens[position])
+
+    @classmethod
+    def __repeated(self, body, times):
+        """
+        Return the nodes of a body repeated the given times. The body is kept
+        once, in a repeat, unless it's a single run, which just gets longer.
+        """
+        if times == 0 or not body:
+            return []
+        if times == 1:
+            return body
+        if len(body) == 1 and not isinstance(body[0], Repeat):
+            (i, body_times) = body[0]
+            return [(i, body_times * times)]
+        return [Repeat(body, times)]
+
+    @classmethod
+    def __checked(self, nodes):
+        """ Return the nodes without the EXIT instructions, nested ones too, failing on invalid ones. """
+        checked = []
+        for node in nodes:
+            if isinstance(node, Repeat):
+                checked.extend(self.__repeated(self.__merged(self.__checked(node.body)), node.times))
+                continue
+            (i, times) = node
+            if ASM.is_EXIT(i):
+                continue
+            if not ASM.is_valid(i):
+                raise SyntaxError("Invalid instruction: " + ASM.mnemonic(i))
+            checked.append(node)
+        return checked
+
+    @classmethod
+    def __merged(self, nodes):
+        """ Return the nodes, joining consecutive runs of the same instruction and dropping empty ones. """
+        merged = []
+        for node in nodes:
+            if isinstance(node, Repeat):
+                merged.append(node)
+                continue
+            (i, times) = node
+            if times == 0:
+                continue
+            if merged and not isinstance(merged[-1], Repeat) and merged[-1][0] == i:
+                merged[-1] = (i, merged[-1][1] + times)
+            else:
+                merged.append((i, times))
+        return merged
+
+    @classmethod
+    def compile_file(self, name, path):
+        """
+        Compile the code in the given file and return a new program.
+        Empty lines and comments (lines starting with #) are ignored.
+        """
+        with open(path) as file_handle:
+            # Read the contents, removing extra spaces and empty lines or comments
+            contents = [line.strip() for line in file_handle.readlines()
+                        if line.strip() != "" and not line.strip().startswith("#")]
+        return self.compile(name, contents)
+
+
+class Repeat:
+    """
+    A body of nodes (runs, or other repeats) repeated some times in a row,
+    as written with REPEAT. The body is kept once, however many times it's
+    repeated.
+    """
+    def __init__(self, body, times):
+        self.__body = body
+        self.__times = times
+        self.__body_size = size_of(body)
+
+    @property
+    def body(self):
+        """ Returns the nodes that are repeated. """
+        return self.__body
+
+    @property
+    def times(self):
+        """ Returns how many times the body is repeated. """
+        return self.__times
+
+    @property
+    def body_size(self):
+        """ Returns the number of instructions of the body. """
+        return self.__body_size
+
+    @property
+    def size(self):
+        """ Returns the number of instructions of the body, repeated. """
+        return self.__body_size * self.__times
+
+    def __repr__(self):
+        return "REPEAT {times} {{{body}}}".format(times=self.__times, body=", ".join(mnemonics(self.__body)))
+
+
+def size_of(nodes):
+    """ Returns the number of instructions of the given nodes. """
+    return sum([node.size if isinstance(node, Repeat) else node[1] for node in nodes])
+
+def mnemonics(nodes):
+    """ Returns the given nodes as text, one element per node. """
+    return [
+        repr(node) if isinstance(node, Repeat) else ASM.mnemonic(node[0]) if node[1] == 1 else ASM.mnemonic(node[0]) + " " + str(node[1])
+        for node in nodes
+    ]
 
 
 class Program():
-    """A program, as a simplification of what is stored in a persistent drive."""
-    def __init__(self, name, instructions):
-        """PRECONDITION: The instructions are valid"""
+    """
+    A program, as a simplification of what is stored in a persistent drive.
+    The program is stored as nodes, which are either runs, that is,
+    (instruction, times) pairs of an instruction repeated some times in a
+    row, or repeats of a body of nodes. Nothing is ever expanded to one
+    element per instruction, unless asked for, as with instructions.
+    """
+    def __init__(self, name, nodes):
+        """PRECONDITION: The nodes are valid"""
         self._name = name
-        self._instructions = instructions
+        self._nodes = nodes
+        self._size = size_of(nodes)
+        self._cpu_counts = None
 
     @property
     def name(self):
         return self._name
 
+    @property
+    def nodes(self):
+        """ Returns the runs and repeats of the program, as compiled. """
+        return self._nodes
+
+    @property
+    def runs(self):
+        """
+        Returns the list of (instruction, times) runs of the program.
+        Avoid it for long programs, as it expands all the repeats.
+        """
+        return list(self.iter_runs())
+
+    def iter_runs(self):
+        """
+        Yield the (instruction, times) runs of the program, one at a time,
+        going over the body of each repeat as many times as it's repeated.
+        """
+        instruction = None
+        times = 0
+        for (i, run_times) in self.__runs(self._nodes):
+            if i == instruction:
+                times += run_times
+                continue
+            if times > 0:
+                yield (instruction, times)
+            instruction = i
+            times = run_times
+        if times > 0:
+            yield (instruction, times)
+
+    def __runs(self, nodes):
+        """ Yield the runs of the given nodes, not merged. """
+        for node in nodes:
+            if isinstance(node, Repeat):
+                for _ in range(node.times):
+                    yield from self.__runs(node.body)
+            else:
+                yield node
+
+    @property
+    def size(self):
+        """ Returns the number of instructions of the program. """
+        return self._size
+
     @property
     def instructions(self):
-        return self._instructions
+        """
+        Returns the list with every instruction of the program.
+        Avoid it for long programs, as it expands all the runs.
+        """
+        return [i for (i, times) in self.iter_runs() for _ in range(times)]
+
+    @property
+    def cpu_counts(self):
+        """
+        Returns, for each position of the program, how many CPU instructions
+        come before it, so the ones between any two positions are counted in
+        O(log nodes). It's built the first time it's asked for, and then
+        reused by every process of the program.
+        """
+        if (self._cpu_counts is None):
+            self._cpu_counts = CpuCounts(self._nodes)
+        return self._cpu_counts
+
+    def chunks(self, size = CHUNK_SIZE):
+        """
+        Yield the instructions of the program as bytes, one per instruction,
+        in chunks of the given size (but the last one, that may be shorter).
+        Only a chunk is expanded at a time, so they can be copied to memory,
+        or to a file, for programs of any length.
+        """
+        buffer = bytearray()
+        for piece in self.__pieces(self._nodes, size):
+            buffer += piece
+            if len(buffer) >= size:
+                yield bytes(buffer[:size])
+                del buffer[:size]
+        if buffer:
+            yield bytes(buffer)
+
+    def __pieces(self, nodes, limit):
+        """
+        Yield the instructions of the given nodes as bytes, in pieces of no
+        more than limit instructions. A body that fits in a piece is expanded
+        once, and then repeated as many times as fit in each piece.
+        """
+        for node in nodes:
+            if not isinstance(node, Repeat):
+                (i, times) = node
+                if times >= limit:
+                    piece = bytes([i]) * limit
+                    for _ in range(times // limit):
+                        yield piece
+                if times % limit > 0:
+                    yield bytes([i]) * (times % limit)
+            elif node.body_size <= limit:
+                body = b"".join(self.__pieces(node.body, limit))
+                copies = limit // len(body)
+                if node.times >= copies:
+                    piece = body * copies
+                    for _ in range(node.times // copies):
+                        yield piece
+                if node.times % copies > 0:
+                    yield body * (node.times % copies)
+            else:
+                for _ in range(node.times):
+                    yield from self.__pieces(node.body, limit)
+
+    def to_bytes(self):
+        """
+        Returns the instructions of the program as bytes, one per instruction.
+        Avoid it for long programs, as it expands the whole program at once,
+        copy its chunks instead.
+        """
+        return b"".join(self.chunks())
 
     def __repr__(self):
-        return "Program({name}, {instructions})".format(name=self._name, instructions=self._instructions)
+        return "Program({name}, {nodes})".format(name=self._name, nodes=mnemonics(self._nodes))
+
+
+class CpuCounts:
+    """
+    How many CPU instructions come before each position of a program,
+    asked for as counts[position]. Only the start of each node, and the
+    CPU instructions before it, are kept, along with the counts of the
+    body of each repeat, which are the same on every repetition. The node
+    of a position is found with a binary search, so both the memory and
+    the time depend on the number of nodes, and not on the number of
+    instructions.
+    """
+    def __init__(self, nodes):
+        self.__starts = array("Q")
+        self.__counts = array("Q")
+        self.__is_cpu = bytearray()
+        # The counts of the body of each repeat, None for the runs
+        self.__bodies = []
+        position = 0
+        count = 0
+        for node in nodes:
+            self.__starts.append(position)
+            self.__counts.append(count)
+            if isinstance(node, Repeat):
+                body = CpuCounts(node.body)
+                self.__is_cpu.append(False)
+                self.__bodies.append(body)
+                position += node.size
+                count += body.total * node.times
+                continue
+            (instruction, times) = node
+            self.__is_cpu.append(instruction == OPCODE_CPU)
+            self.__bodies.append(None)
+            position += times
+            if (instruction == OPCODE_CPU):
+                count += times
+        self.__size = position
+        self.__total = count
+
+    @property
+    def size(self):
+        """ Returns the number of instructions counted. """
+        return self.__size
+
+    @property
+    def total(self):
+        """ Returns the number of CPU instructions among them. """
+        return self.__total
+
+    def __getitem__(self, position):
+        """ Returns the number of CPU instructions before the given position. """
+        if (position >= self.__size):
+            return self.__total
+        node = bisect_right(self.__starts, position) - 1
+        offset = position - self.__starts[node]
+        body = self.__bodies[node]
+        if (body is not None):
+            repetitions, offset = divmod(offset, body.size)
+            return self.__counts[node] + repetitions * body.total + body[offset]
+        if (self.__is_cpu[node]):
+            return self.__counts[node] + offset
+        return self.__counts[node]
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from utilities.compiler import Compiler, Program, Repeat
+
+# How many compiled programs are kept in memory by default
+DEFAULT_CAPACITY = 64
+
+class ProgramCache:
+    """
+    Keeps the programs compiled from files, so loading the same file many
+    times compiles it only once. Programs are kept in memory, with the
+    least recently used one discarded when the cache is full, and may also
+    be stored compiled in a folder, so they survive between runs.
+    A program is identified by the path, size and modification time of
+    its file, so editing the file compiles it again.
+    The same Program is returned every time, so the processes that run
+    it share its text and CPU counts. It keeps the name it was compiled
+    with. To show a process under another name, give it when loading
+    the program (Kernel.load_program).
+    """
+
+    def __init__(self, capacity = DEFAULT_CAPACITY, artifacts_folder = None):
+        self.__capacity = capacity
+        self.__artifacts_folder = artifacts_folder
+        # From the path of the file to a pair (key, program)
+        self.__programs = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        """ Returns the number of programs found already compiled. """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """ Returns the number of programs that had to be compiled. """
+        return self.__misses
+
+    def compile_file(self, name, path):
+        """
+        Return the program compiled from the given file, compiling it
+        only if there is no compiled version of the current file. The
+        name is only used when compiling.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = [path, stat.st_size, stat.st_mtime_ns]
+
+        if path in self.__programs and self.__programs[path][0] == key:
+            self.__hits += 1
+            self.__programs.move_to_end(path)
+            return self.__programs[path][1]
+
+        program = self.__read_artifact(key)
+        if program is None:
+            self.__misses += 1
+            program = Compiler.compile_file(name, path)
+            self.__write_artifact(key, program)
+        else:
+            self.__hits += 1
+
+        self.__programs[path] = (key, program)
+        self.__programs.move_to_end(path)
+        if len(self.__programs) > self.__capacity:
+            self.__programs.popitem(last=False)
+        return program
+
+    def clear(self):
+        """ Forget the programs kept in memory. Stored ones are kept. """
+        self.__programs.clear()
+
+    def __artifact_path(self, path):
+        """ Returns the path where the compiled version of a file is stored. """
+        digest = hashlib.sha1(path.encode()).hexdigest()
+        return os.path.join(self.__artifacts_folder, digest + '.json')
+
+    def __read_artifact(self, key):
+        """ Returns the stored program for the given key, or None if there is none. """
+        if self.__artifacts_folder is None:
+            return None
+        try:
+            with open(self.__artifact_path(key[0])) as file_handle:
+                artifact = json.load(file_handle)
+        except (OSError, ValueError):
+            return None
+        # A stale artifact, of a file that changed since, or of an older
+        # format, is ignored
+        if artifact['key'] != key or 'nodes' not in artifact:
+            return None
+        return Program(artifact['name'], self.__decoded(artifact['nodes']))
+
+    def __write_artifact(self, key, program):
+        """ Store the compiled program, if there is a folder to store it. """
+        if self.__artifacts_folder is None:
+            return
+        os.makedirs(self.__artifacts_folder, exist_ok=True)
+        artifact = {
+            'key': key,
+            'name': program.name,
+            'nodes': self.__encoded(program.nodes)
+        }
+        # Write to a temporary file first, so a half written artifact is never read
+        artifact_path = self.__artifact_path(key[0])
+        with open(artifact_path + '.tmp', 'w') as file_handle:
+            json.dump(artifact, file_handle)
+        os.replace(artifact_path + '.tmp', artifact_path)
+
+    def __encoded(self, nodes):
+        """
+        Returns the nodes of a program as JSON values: a run as an
+        [instruction, times] pair, and a repeat as a {body, times} object.
+        """
+        return [
+            {'body': self.__encoded(node.body), 'times': node.times} if isinstance(node, Repeat) else [int(node[0]), node[1]]
+            for node in nodes
+        ]
+
+    def __decoded(self, nodes):
+        """ Returns the nodes of a program stored as JSON values. """
+        return [
+            Repeat(self.__decoded(node['body']), node['times']) if isinstance(node, dict) else (node[0], node[1])
+            for node in nodes
+        ]
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Binary program images: a compiled program stored as the bytes of its
+opcodes, ready to be copied into memory, so large programs do not need
+to be parsed from their text form each time they are loaded.
+
+Convert a program from the repository root, for example:
+    python -m utilities.program_image programs/cpu_long.asm cpu_long.img
+"""
+import mmap
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from hardware.asm import OPCODE_CPU, OPCODE_IO
+
+from utilities.compiler import CHUNK_SIZE, Compiler, CpuCounts, Program
+
+"""
+The layout of an image is:
+    - The header: the magic bytes, the version of the format, flags, the
+      length of the name, the number of instructions, the number of CPU
+      instructions and the number of IO instructions.
+    - The name of the program, in UTF-8.
+    - The opcodes, one byte per instruction.
+    - If it has metadata, the position of each IO instruction, as 8 byte
+      little endian numbers.
+"""
+IMAGE_MAGIC = b"OSPI"
+IMAGE_VERSION = 1
+IMAGE_HEADER = struct.Struct("<4sHHIQQQ")
+# The flag set when the image includes the precomputed metadata
+FLAG_METADATA = 1
+# The extension used for the image files
+IMAGE_EXTENSION = ".img"
+# Matches a run of the same byte, so the runs of an image are found by
+# the regex engine instead of going over the opcodes one by one
+RUN_PATTERN = re.compile(b"|".join(re.escape(bytes([value])) + b"+" for value in range(256)))
+
+class ProgramImage:
+    """
+    A program stored in a binary image file. The file is mapped in memory,
+    so its opcodes are read from the disk only when copied, and can be
+    copied to the memory of the hardware in a single slice operation.
+    An open image can be loaded as any other program, and should be
+    closed once it's loaded.
+    """
+
+    @classmethod
+    def save(self, program, path, metadata = True):
+        """
+        Store the given program as an image in the given path.
+        The metadata (the number of CPU instructions and the position of
+        the IO ones) makes the image a bit bigger, but saves a full scan
+        of the opcodes when asked for them.
+        The opcodes are written in chunks, so the program is never
+        expanded as a whole.
+        """
+        name = program.name.encode("utf-8")
+        io_positions = array("Q")
+        if metadata:
+            position = 0
+            for (instruction, times) in program.iter_runs():
+                if instruction == OPCODE_IO:
+                    io_positions.extend(range(position, position + times))
+                position += times
+            if sys.byteorder == "big":
+                io_positions.byteswap()
+        header = IMAGE_HEADER.pack(
+            IMAGE_MAGIC,
+            IMAGE_VERSION,
+            FLAG_METADATA if metadata else 0,
+            len(name),
+            program.size,
+            program.cpu_counts[program.size] if metadata else 0,
+            len(io_positions)
+        )
+        with open(path, "wb") as file_handle:
+            file_handle.write(header)
+            file_handle.write(name)
+            for chunk in program.chunks():
+                file_handle.write(chunk)
+            file_handle.write(io_positions.tobytes())
+
+    @classmethod
+    def open(self, path):
+        """ Open the image in the given path. """
+        with open(path, "rb") as file_handle:
+            mapped = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return ProgramImage(mapped)
+
+    def __init__(self, mapped):
+        """ Use ProgramImage.open instead. """
+        self.__mapped = mapped
+        if len(mapped) < IMAGE_HEADER.size:
+            mapped.close()
+            raise RuntimeError("Not a program image, it's too short")
+        (magic, version, flags, name_length, size, cpu_count, io_count) = IMAGE_HEADER.unpack_from(mapped)
+        if magic != IMAGE_MAGIC or version != IMAGE_VERSION:
+            mapped.close()
+            raise RuntimeError("Not a program image, or one of an unknown version")
+        self.__name = mapped[IMAGE_HEADER.size:IMAGE_HEADER.size + name_length].decode("utf-8")
+        self.__opcodes_start = IMAGE_HEADER.size + name_length
+        self.__opcodes_end = self.__opcodes_start + size
+        self.__size = size
+        self.__has_metadata = bool(flags & FLAG_METADATA)
+        self.__cpu_count = cpu_count
+        self.__io_count = io_count
+        self.__cpu_counts = None
+        self.__runs = None
+        self.__view = memoryview(mapped)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """ Close the image. Its opcodes cannot be read after it. """
+        self.__view.release()
+        self.__mapped.close()
+
+    @property
+    def name(self):
+        """ Returns the name of the program. """
+        return self.__name
+
+    @property
+    def size(self):
+        """ Returns the number of instructions of the program. """
+        return self.__size
+
+    @property
+    def has_metadata(self):
+        """ Returns if the metadata is stored in the image. """
+        return self.__has_metadata
+
+    @property
+    def cpu_count(self):
+        """ Returns the number of CPU instructions of the program. """
+        if not self.__has_metadata:
+            return self.to_bytes().tobytes().count(OPCODE_CPU)
+        return self.__cpu_count
+
+    @property
+    def io_positions(self):
+        """ Returns the positions, in the program, of the IO instructions. """
+        if not self.__has_metadata:
+            return array("Q", [position for (position, opcode) in enumerate(self.to_bytes()) if opcode == OPCODE_IO])
+        start = self.__opcodes_end
+        positions = array("Q")
+        positions.frombytes(self.__view[start:start + 8 * self.__io_count])
+        if sys.byteorder == "big":
+            positions.byteswap()
+        return positions
+
+    @property
+    def cpu_counts(self):
+        """
+        Returns how many CPU instructions come before each position, as a
+        program does. With the metadata, they are counted from the positions
+        of the IO instructions, without going over the opcodes.
+        """
+        if self.__cpu_counts is None:
+            if self.__has_metadata:
+                self.__cpu_counts = ImageCpuCounts(self.io_positions, self.__size)
+            else:
+                self.__cpu_counts = CpuCounts(self.runs)
+        return self.__cpu_counts
+
+    @property
+    def runs(self):
+        """
+        Returns the (instruction, times) runs of the program. They are
+        found with a single regex scan, which costs one step per run, not
+        per opcode, and then kept.
+        """
+        if self.__runs is None:
+            opcodes = self.to_bytes()
+            self.__runs = [(opcodes[match.start()], match.end() - match.start()) for match in RUN_PATTERN.finditer(opcodes)]
+        return self.__runs
+
+    def to_bytes(self):
+        """
+        Returns the opcodes of the program, without copying them,
+        as a view of the image that is only valid while it's open.
+        """
+        return self.__view[self.__opcodes_start:self.__opcodes_end]
+
+    def chunks(self, size = CHUNK_SIZE):
+        """
+        Yield the opcodes of the program in chunks of the given size (but
+        the last one, that may be shorter), as a program does. They are
+        views of the image, only valid while it's open.
+        """
+        opcodes = self.to_bytes()
+        for start in range(0, self.__size, size):
+            yield opcodes[start:start + size]
+
+    def to_program(self):
+        """ Returns the program stored in the image. """
+        return Program(self.__name, self.runs)
+
+    def __repr__(self):
+        return "ProgramImage({name}, {size} instructions)".format(name=self.__name, size=self.__size)
+
+
+class ImageCpuCounts:
+    """
+    How many CPU instructions come before each position of a program,
+    asked for as counts[position], known from the positions of its IO
+    instructions. As a program has only CPU and IO instructions, and
+    EXIT as the last one, the ones before a position that are not IO
+    are CPU, except for the EXIT.
+    """
+    def __init__(self, io_positions, size):
+        self.__io_positions = io_positions
+        self.__size = size
+
+    def __getitem__(self, position):
+        """ Returns the number of CPU instructions before the given position. """
+        position = min(position, self.__size)
+        count = position - bisect_left(self.__io_positions, position)
+        if (position == self.__size):
+            # Do not count the EXIT
+            count -= 1
+        return count
+
+
+def main(arguments):
+    if len(arguments) != 2:
+        print("Usage: python -m utilities.program_image <program.asm> <image" + IMAGE_EXTENSION + ">")
+        return 1
+    source, path = arguments
+    ProgramImage.save(Compiler.compile_file(source, source), path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
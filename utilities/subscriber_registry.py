@@ -0,0 +1,54 @@
+class SubscriberRegistry:
+    """
+    Models a set of subscribers ordered by priority, where the highest
+    priority goes first, and subscribers with the same priority keep the
+    order in which they were added (the same order a PriorityQueue yields).
+    The order is computed only when the subscribers change, so walking the
+    subscribers, or calling their tick method, does not sort anything.
+    """
+
+    def __init__(self):
+        self.__entries = []
+        self.__index = 0
+        self.__subscribers = ()
+        self.__tick_calls = ()
+
+    @property
+    def subscribers(self):
+        """ Returns a frozen tuple with the subscribers, in priority order. """
+        return self.__subscribers
+
+    @property
+    def tick_calls(self):
+        """ Returns a frozen tuple with the bound tick method of every subscriber, in priority order. """
+        return self.__tick_calls
+
+    def add(self, subscriber, priority=0):
+        """ Add a subscriber with the given priority. """
+        self.__entries.append((-priority, self.__index, subscriber))
+        self.__index += 1
+        self.__compile()
+
+    def remove(self, subscriber):
+        """ Remove a subscriber. Fails if it was never added. """
+        for entry in self.__entries:
+            if entry[-1] is subscriber:
+                self.__entries.remove(entry)
+                self.__compile()
+                return
+        raise RuntimeError("The subscriber {subscriber} is not registered".format(subscriber=subscriber))
+
+    def __compile(self):
+        """ Rebuild the frozen subscribers and tick calls lists. """
+        self.__entries.sort(key=lambda entry: entry[:2])
+        self.__subscribers = tuple(s for (p, i, s) in self.__entries)
+        self.__tick_calls = tuple(s.tick for s in self.__subscribers)
+
+    def __len__(self):
+        return len(self.__subscribers)
+
+    def __iter__(self):
+        return self.__subscribers.__iter__()
+
+    def __repr__(self):
+        return " <- ".join([str(s) for s in self.__subscribers])
@@ -0,0 +1,222 @@
+import math
+from random import Random
+
+from hardware.asm import ASM, Opcode
+
+from utilities.compiler import Program
+
+class Constant:
+    """ A distribution that always gives the same value. """
+
+    def __init__(self, value):
+        self.__value = value
+
+    def sample(self, random):
+        return self.__value
+
+    def __repr__(self):
+        return "Constant({value})".format(value=self.__value)
+
+
+class Uniform:
+    """ A distribution of integers between low and high, both included, all equally likely. """
+
+    def __init__(self, low, high):
+        if (low > high):
+            raise RuntimeError("The low value of a uniform distribution cannot be higher than the high one")
+        self.__low = low
+        self.__high = high
+
+    def sample(self, random):
+        return random.randint(self.__low, self.__high)
+
+    def __repr__(self):
+        return "Uniform({low}, {high})".format(low=self.__low, high=self.__high)
+
+
+class Exponential:
+    """
+    A distribution of integers around a mean, where small values are the
+    most likely ones but long ones still happen. Used for the time between
+    arrivals, it models processes arriving independently of each other.
+    """
+
+    def __init__(self, mean):
+        if (mean <= 0):
+            raise RuntimeError("The mean of an exponential distribution should be positive")
+        self.__mean = mean
+
+    def sample(self, random):
+        return int(math.floor(random.expovariate(1 / self.__mean)))
+
+    def __repr__(self):
+        return "Exponential({mean})".format(mean=self.__mean)
+
+
+class Bimodal:
+    """
+    A distribution that mixes two others: it samples the large one with
+    the given probability, and the small one otherwise. It models, for
+    example, many small programs and a few big ones.
+    """
+
+    def __init__(self, small, large, large_probability):
+        if (large_probability < 0 or large_probability > 1):
+            raise RuntimeError("The probability of a bimodal distribution should be between 0 and 1")
+        self.__small = small
+        self.__large = large
+        self.__large_probability = large_probability
+
+    def sample(self, random):
+        if (random.random() < self.__large_probability):
+            return self.__large.sample(random)
+        return self.__small.sample(random)
+
+    def __repr__(self):
+        return "Bimodal({small}, {large}, {probability})".format(
+            small=self.__small, large=self.__large, probability=self.__large_probability)
+
+
+class Pareto:
+    """
+    A heavy-tailed distribution of integers from a minimum on: most values
+    are close to it, but huge ones are far more likely than with an
+    exponential distribution. The lower the shape, the heavier the tail.
+    Values are capped at the maximum, if given.
+    """
+
+    def __init__(self, minimum, shape, maximum = None):
+        if (minimum <= 0 or shape <= 0):
+            raise RuntimeError("The minimum and shape of a pareto distribution should be positive")
+        self.__minimum = minimum
+        self.__shape = shape
+        self.__maximum = maximum
+
+    def sample(self, random):
+        value = int(self.__minimum * random.paretovariate(self.__shape))
+        return value if self.__maximum is None else min(value, self.__maximum)
+
+    def __repr__(self):
+        return "Pareto({minimum}, {shape}, {maximum})".format(
+            minimum=self.__minimum, shape=self.__shape, maximum=self.__maximum)
+
+
+class WorkloadGenerator:
+    """
+    Generates synthetic workloads, that is, programs and the time they
+    arrive, from the distributions of:
+        - length: The number of instructions of a program, besides EXIT.
+        - cpu_burst: The number of CPU instructions in a row.
+        - io_burst: The number of IO instructions in a row.
+        - interarrival: The number of ticks between the arrival of a program
+          and the next one.
+    After each CPU burst, an IO burst follows with a probability of
+    io_frequency. Programs are generated one at a time, when asked for, and
+    as runs of instructions, so a workload may have any number of programs
+    of any length. The same seed always generates the same workload.
+    """
+
+    def __init__(self, seed = None, length = Uniform(5, 20), cpu_burst = Exponential(4), io_burst = Constant(1),
+                 io_frequency = 0.5, interarrival = Exponential(3), name_prefix = 'synthetic'):
+        if (io_frequency < 0 or io_frequency > 1):
+            raise RuntimeError("The IO frequency should be between 0 and 1")
+        self.__seed = seed
+        self.__length = length
+        self.__cpu_burst = cpu_burst
+        self.__io_burst = io_burst
+        self.__io_frequency = io_frequency
+        self.__interarrival = interarrival
+        self.__name_prefix = name_prefix
+
+    def workload(self, count = None):
+        """
+        Yield (arrival, program) pairs, where the arrival is the number of
+        ticks elapsed since the first arrival. Yields count programs, or
+        never stops if count is None.
+        """
+        random = Random(self.__seed)
+        arrival = 0
+        number = 0
+        while (count is None or number < count):
+            yield arrival, self.__program(random, number)
+            number += 1
+            arrival += self.__interarrival.sample(random)
+
+    def programs(self, count = None):
+        """ Yield count programs, or never stop if count is None, ignoring their arrival. """
+        for _, program in self.workload(count):
+            yield program
+
+    def __program(self, random, number):
+        """ Generate a single program, as runs of instructions. """
+        length = max(1, self.__length.sample(random))
+        runs = []
+        cpu_instructions = 0
+        size = 0
+        while (size < length):
+            burst = min(max(1, self.__cpu_burst.sample(random)), length - size)
+            cpu_instructions += burst
+            size += burst
+            if (size < length and random.random() < self.__io_frequency):
+                # The CPU burst ends, add it and the IO that follows
+                runs.append((Opcode.CPU, cpu_instructions))
+                cpu_instructions = 0
+                burst = min(max(1, self.__io_burst.sample(random)), length - size)
+                runs.append((Opcode.IO, burst))
+                size += burst
+        if (cpu_instructions > 0):
+            runs.append((Opcode.CPU, cpu_instructions))
+        runs.append((ASM.EXIT(), 1))
+        return Program("{prefix}_{number}".format(prefix=self.__name_prefix, number=number), runs)
+
+
+class WorkloadFeeder:
+    """
+    Loads the programs of a workload, that is, (arrival, program) pairs
+    with increasing arrivals, when each one arrives. Only the next program
+    to arrive is scheduled in the clock, so the workload is consumed lazily.
+    Arrivals count the ticks from the moment the feeder starts, and each
+    program is loaded right before the tick after its arrival.
+    """
+
+    def __init__(self, kernel, workload):
+        self.__kernel = kernel
+        self.__clock = kernel.hardware.clock
+        self.__workload = iter(workload)
+        self.__start_tick = None
+        self.__next = None
+        self.__loaded = 0
+
+    @property
+    def loaded(self):
+        """ Returns the number of programs loaded so far. """
+        return self.__loaded
+
+    @property
+    def is_exhausted(self):
+        """ Returns if every program of the workload has been loaded. """
+        return self.__start_tick is not None and self.__next is None
+
+    def start(self):
+        """ Start feeding the workload from the current tick. """
+        self.__start_tick = self.__clock.last_tick
+        self.__schedule_next()
+
+    def __tick_of(self, arrival):
+        """ Returns the tick right before which a program that arrives at the given time is loaded. """
+        return self.__start_tick + arrival + 1
+
+    def __schedule_next(self):
+        """ Take the next program of the workload, and schedule its loading. """
+        self.__next = next(self.__workload, None)
+        if (self.__next is not None):
+            self.__clock.schedule(self.__tick_of(self.__next[0]), self.__load_arrived)
+
+    def __load_arrived(self):
+        """ Load every program that has arrived by now, and schedule the next one. """
+        while (self.__next is not None and self.__tick_of(self.__next[0]) <= self.__clock.last_tick):
+            self.__kernel.load_program(self.__next[1])
+            self.__loaded += 1
+            self.__next = next(self.__workload, None)
+        if (self.__next is not None):
+            self.__clock.schedule(self.__tick_of(self.__next[0]), self.__load_arrived)